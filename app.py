@@ -1,7 +1,14 @@
+import hashlib
+import os
+import numpy as np
 import streamlit as st
-from matcher import match_with_weights
-from resume_parser import extract_text_from_file
-from ui_helpers import highlight_text, extract_snippets
+from matcher import match_batch, combine_scores
+from resume_parser import extract_texts_parallel
+from ui_helpers import highlight_text, extract_snippets, get_matcher, iter_csv
+from tokenizer import prepare
+import metrics
+import warmup
+import dedup
 from feedback import save_feedback, list_feedback
 
 st.set_page_config(page_title="Resume Screener MVP", page_icon="📄", layout="centered")
@@ -26,81 +33,215 @@ st.sidebar.header("Scoring weights")
 weight_embedding = st.sidebar.slider("Embedding weight", min_value=0.0, max_value=1.0, value=0.7, step=0.05)
 weight_keywords = st.sidebar.slider("Keyword weight", min_value=0.0, max_value=1.0, value=0.3, step=0.05)
 
+
+def _file_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@st.cache_resource(show_spinner=False)
+def _start_warmup():
+    """Preload the embedding model and parsers once per process, on a background thread."""
+    return warmup.start()
+
+
+PAGE_SIZES = [10, 20, 50, 100]
+MAX_FILE_BYTES = int(os.environ.get('RESUME_MAX_FILE_BYTES', 10 * 1024 * 1024))
+RESULT_CSV_FIELDS = ['candidate', 'score', 'cluster', 'duplicate_of', 'top_keywords']
+
+# Per-session stores that survive reruns: parsed documents by file hash, component scores by
+# (JD hash, file hash), and the last screening run. Widget changes only recombine scores.
+parsed_store = st.session_state.setdefault('parsed', {})
+component_store = st.session_state.setdefault('components', {})
+
 if st.button("Run Screening"):
     if not jd_text.strip():
         st.error("Please provide a job description or skills.")
     elif not uploaded_files:
         st.error("Please upload at least one resume file.")
     else:
-        results = []
+        # oversized uploads are skipped on their declared size, before their bytes are copied
         for f in uploaded_files:
-            parsed = extract_text_from_file(f)
-            score, details = match_with_weights(jd_text, parsed, weight_embedding=weight_embedding, weight_keywords=weight_keywords)
-            results.append((f.name, score, details, parsed))
-
-        # Display results in card-like layout
-        st.subheader("Results")
-        cols = st.columns(2)
-        sorted_results = sorted(results, key=lambda x: x[1], reverse=True)
-        # CSV export
-        import pandas as _pd
-        df_rows = []
-        for name, score, details, parsed in sorted_results:
-            df_rows.append({'candidate': name, 'score': float(score), 'top_keywords': ','.join(details.get('top_keywords', [])[:10])})
-        if df_rows:
-            df = _pd.DataFrame(df_rows)
-            csv = df.to_csv(index=False).encode('utf-8')
-            st.download_button("Download results CSV", data=csv, file_name='screening_results.csv', mime='text/csv')
-
-        for idx, (name, score, details, parsed) in enumerate(sorted_results):
-            col = cols[idx % 2]
-            with col:
-                st.markdown(f"<div style='background:{CARD}; padding:12px; border-radius:10px; margin-bottom:10px;'>", unsafe_allow_html=True)
-                st.markdown(f"<h3 style='color:{SECONDARY}; margin:0 0 6px 0;'>{name} - {score*100:.1f}%</h3>", unsafe_allow_html=True)
-                st.markdown(f"<div style='color:{SECONDARY}; opacity:0.9; font-size:14px;'>Top keywords: {', '.join(details.get('top_keywords', [])[:10])}</div>", unsafe_allow_html=True)
-                st.markdown(f"<div style='margin-top:8px; color:{SECONDARY};'>Skill similarity: {details.get('skill_sim', 0):.3f} &nbsp; | &nbsp; Experience similarity: {details.get('exp_sim', 0):.3f}</div>", unsafe_allow_html=True)
-
-                # show highlighted snippets
-                snippets = extract_snippets(parsed.get('text', ''), details.get('top_keywords', [])[:8])
-                for s in snippets:
-                    highlighted = highlight_text(s, details.get('top_keywords', [])[:8])
-                    st.markdown(f"<div style='margin-top:8px; background:transparent; padding:6px; color:{SECONDARY};'>" + highlighted + "</div>", unsafe_allow_html=True)
-
-                # small meta listing
-                if parsed.get('meta'):
-                    metas = parsed['meta']
-                    meta_lines = []
-                    for k, v in metas.items():
-                        if isinstance(v, (list, tuple)):
-                            meta_lines.append(f"{k}: {', '.join([str(x) for x in v][:5])}")
-                        else:
-                            meta_lines.append(f"{k}: {str(v)[:120]}")
-                    st.markdown(f"<div style='color:{SECONDARY}; opacity:0.8; margin-top:8px; font-size:12px;'>{'<br>'.join(meta_lines)}</div>", unsafe_allow_html=True)
+            if f.size > MAX_FILE_BYTES:
+                st.warning(f"Skipped {f.name}: {f.size} bytes exceeds the {MAX_FILE_BYTES} byte limit")
+        uploaded_files = [f for f in uploaded_files if f.size <= MAX_FILE_BYTES]
+        # hash the upload buffers in place; payloads are copied only as workers take them
+        hashes = [_file_hash(f.getbuffer()) for f in uploaded_files]
+        missing, seen = [], set(parsed_store)
+        for i, h in enumerate(hashes):
+            if h not in seen:
+                seen.add(h)
+                missing.append(i)
+        if missing:
+            progress = st.progress(0.0, text="Parsing resumes...")
+            payloads = ((uploaded_files[i].name, uploaded_files[i].getvalue()) for i in missing)
+            for done, outcome in enumerate(extract_texts_parallel(payloads, max_size_bytes=MAX_FILE_BYTES), start=1):
+                if outcome['ok']:
+                    parsed = outcome['result']
+                    # tokenize each resume once; matcher and UI helpers reuse the prepared document
+                    parsed_store[hashes[missing[outcome['index']]]] = {'text': prepare(parsed.get('text', '')), 'meta': parsed.get('meta', {}), 'stats': parsed.get('stats', {})}
+                elif outcome['error']['type'] == 'rejected':
+                    # not a candidate: left out of parsed_store, so it is not screened
+                    st.warning(f"Skipped {outcome['name']}: {outcome['error']['message']}")
+                else:
+                    st.warning(f"Could not parse {outcome['name']}: {outcome['error']['type']} ({outcome['error']['message']})")
+                progress.progress(done / len(missing), text=f"Parsed {done}/{len(missing)}: {outcome['name']}")
+            progress.empty()
+
+        jd_hash = _file_hash(jd_text.encode('utf-8'))
+        jd_doc = prepare(jd_text)
+        # every upload is kept, so identical copies are listed and exported like near-duplicates
+        screened = [(f.name, h) for f, h in zip(uploaded_files, hashes) if h in parsed_store]
+        # near-duplicates (re-exports, PDF + DOCX of one CV, small edits) are scored once per cluster;
+        # byte-identical uploads share a hash and so a cluster member
+        cluster_of = dedup.cluster_near_duplicates({h: parsed_store[h]['text'] for _, h in screened})
+        metrics.count('near_duplicates', len(screened) - sum(1 for h, rep in cluster_of.items() if h == rep))
+        to_score = [h for h, rep in cluster_of.items() if h == rep and (jd_hash, h) not in component_store]
+        if to_score:
+            for h, (_, details) in zip(to_score, match_batch(jd_doc, [parsed_store[h] for h in to_score])):
+                component_store[(jd_hash, h)] = details
+
+        # keep the stores bounded to what the latest run uses
+        keep = set(h for _, h in screened)
+        for h in [h for h in parsed_store if h not in keep]:
+            del parsed_store[h]
+        for key in [k for k in component_store if k[0] != jd_hash or k[1] not in keep]:
+            del component_store[key]
+        st.session_state['screening'] = {'jd_hash': jd_hash, 'jd_text': jd_text, 'jd_doc': jd_doc, 'files': screened, 'clusters': cluster_of}
+
+screening = st.session_state.get('screening')
+if screening and screening['files']:
+    jd_doc = screening['jd_doc']
+    screened_jd_text = screening['jd_text']
+    cluster_of = screening.get('clusters', {})
+    # one card per cluster, shown under its first upload; the other copies (identical or near) are listed on it
+    representatives = []
+    duplicates = {}
+    for name, h in screening['files']:
+        rep = cluster_of.get(h, h)
+        if rep == h and h not in duplicates:
+            representatives.append((name, h))
+            duplicates[h] = []
+        else:
+            duplicates.setdefault(rep, []).append(name)
+    hashes = [h for _, h in representatives]
+    component_keys = set(hashes)
+    details_list = [component_store[(screening['jd_hash'], h)] for h in hashes]
+    # a weight change only recombines the stored components
+    scores = combine_scores([d['skill_sim'] for d in details_list], [d['exp_sim'] for d in details_list], weight_embedding, weight_keywords)
+    results = [(name, float(score), details, parsed_store[h], h) for (name, h), score, details in zip(representatives, scores, details_list)]
+
+    # Display results in card-like layout; only the current page of the sorted store is rendered
+    st.subheader("Results")
+    order = np.argsort(-scores, kind='stable')
+    sorted_results = [results[i] for i in order]
 
+    # CSV export, streamed row by row with the csv module and rebuilt only when the ranking changes
+    csv_key = (screening['jd_hash'], weight_embedding, weight_keywords, tuple(screening['files']))
+    csv_cache = st.session_state.get('results_csv')
+    if not csv_cache or csv_cache[0] != csv_key:
+        def _csv_rows():
+            for name, score, details, _, file_hash in sorted_results:
+                # every uploaded copy gets a row carrying its cluster's score
+                for member in [name] + duplicates.get(file_hash, []):
+                    yield {'candidate': member, 'score': score, 'cluster': name,
+                           'duplicate_of': '' if member == name else name,
+                           'top_keywords': ','.join(details.get('top_keywords', [])[:10])}
+        csv_cache = (csv_key, ''.join(iter_csv(_csv_rows(), RESULT_CSV_FIELDS)).encode('utf-8'))
+        st.session_state['results_csv'] = csv_cache
+    st.download_button("Download results CSV", data=csv_cache[1], file_name='screening_results.csv', mime='text/csv')
+
+    page_size = st.selectbox("Candidates per page", PAGE_SIZES, index=1)
+    n_pages = max(1, -(-len(sorted_results) // page_size))
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1) if n_pages > 1 else 1
+    first = (page - 1) * page_size
+    page_results = sorted_results[first:first + page_size]
+    st.caption(f"Showing {first + 1}-{first + len(page_results)} of {len(sorted_results)} candidates")
+
+    # snippets/rationale per (JD, file), computed the first time a card is expanded
+    explanations = st.session_state.setdefault('explanations', {})
+    for key in [k for k in explanations if k[0] != screening['jd_hash'] or k[1] not in component_keys]:
+        del explanations[key]
+
+    cols = st.columns(2)
+    for idx, (name, score, details, parsed, file_hash) in enumerate(page_results):
+        col = cols[idx % 2]
+        with col:
+            st.markdown(f"<div style='background:{CARD}; padding:12px; border-radius:10px; margin-bottom:10px;'>", unsafe_allow_html=True)
+            st.markdown(f"<h3 style='color:{SECONDARY}; margin:0 0 6px 0;'>{first + idx + 1}. {name} - {score*100:.1f}%</h3>", unsafe_allow_html=True)
+            st.markdown(f"<div style='color:{SECONDARY}; opacity:0.9; font-size:14px;'>Top keywords: {', '.join(details.get('top_keywords', [])[:10])}</div>", unsafe_allow_html=True)
+            if duplicates.get(file_hash):
+                st.markdown(f"<div style='color:{SECONDARY}; opacity:0.8; font-size:13px;'>Duplicate uploads (scored once): {', '.join(duplicates[file_hash])}</div>", unsafe_allow_html=True)
+            st.markdown(f"<div style='margin-top:8px; color:{SECONDARY};'>Skill similarity: {details.get('skill_sim', 0):.3f} &nbsp; | &nbsp; Experience similarity: {details.get('exp_sim', 0):.3f}</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+            if not st.toggle("Details and feedback", key=f"open_{file_hash}"):
+                continue
+
+            cached = explanations.get((screening['jd_hash'], file_hash))
+            if cached is None:
+                keywords = get_matcher(details.get('top_keywords', [])[:8])
+                cached = {
+                    'snippets': [highlight_text(s, keywords) for s in extract_snippets(parsed.get('text', ''), keywords)],
+                    'rationale': [],
+                }
                 # explainability / rationale (nearest JD sentences)
                 try:
                     from matcher import explain_match
-                    rationale = explain_match(jd_text, parsed, top_k=3)
-                    if rationale:
-                        st.markdown(f"<div style='margin-top:8px; color:{SECONDARY};'><b>Rationale (top snippets):</b></div>", unsafe_allow_html=True)
-                        for r in rationale:
-                            left = highlight_text(r.get('resume_sentence',''), details.get('top_keywords', [])[:8])
-                            right = r.get('best_jd_sentence','') or ''
-                            st.markdown(f"<div style='margin-top:6px; color:{SECONDARY}; font-size:13px;'><b>Resume:</b> {left}<br/><b>JD:</b> {right}<br/><i>score: {r.get('score',0):.3f}</i></div>", unsafe_allow_html=True)
+                    cached['rationale'] = [dict(r, resume_sentence=highlight_text(r.get('resume_sentence', ''), keywords))
+                                           for r in explain_match(jd_doc, parsed, top_k=3)]
                 except Exception:
                     pass
+                explanations[(screening['jd_hash'], file_hash)] = cached
+
+            # show highlighted snippets
+            for highlighted in cached['snippets']:
+                st.markdown(f"<div style='margin-top:8px; background:transparent; padding:6px; color:{SECONDARY};'>" + highlighted + "</div>", unsafe_allow_html=True)
 
-                st.markdown("</div>", unsafe_allow_html=True)
+            # small meta listing
+            if parsed.get('meta'):
+                metas = parsed['meta']
+                meta_lines = []
+                for k, v in metas.items():
+                    if isinstance(v, (list, tuple)):
+                        meta_lines.append(f"{k}: {', '.join([str(x) for x in v][:5])}")
+                    else:
+                        meta_lines.append(f"{k}: {str(v)[:120]}")
+                st.markdown(f"<div style='color:{SECONDARY}; opacity:0.8; margin-top:8px; font-size:12px;'>{'<br>'.join(meta_lines)}</div>", unsafe_allow_html=True)
 
-                # feedback form
-                with st.form(key=f"fb_{idx}"):
-                    st.write("Give feedback for this candidate:")
-                    rating = st.slider("Rating (1-5)", min_value=1, max_value=5, value=4, key=f"r_{idx}")
-                    comments = st.text_area("Comments (optional)", key=f"c_{idx}")
-                    submitted = st.form_submit_button("Submit feedback")
-                    if submitted:
-                        save_feedback(name, jd_text, rating, comments)
-                        st.success("Feedback saved")
+            if cached['rationale']:
+                st.markdown(f"<div style='margin-top:8px; color:{SECONDARY};'><b>Rationale (top snippets):</b></div>", unsafe_allow_html=True)
+                for r in cached['rationale']:
+                    right = r.get('best_jd_sentence','') or ''
+                    st.markdown(f"<div style='margin-top:6px; color:{SECONDARY}; font-size:13px;'><b>Resume:</b> {r['resume_sentence']}<br/><b>JD:</b> {right}<br/><i>score: {r.get('score',0):.3f}</i></div>", unsafe_allow_html=True)
+
+            # feedback form
+            with st.form(key=f"fb_{file_hash}"):
+                st.write("Give feedback for this candidate:")
+                rating = st.slider("Rating (1-5)", min_value=1, max_value=5, value=4, key=f"r_{file_hash}")
+                comments = st.text_area("Comments (optional)", key=f"c_{file_hash}")
+                submitted = st.form_submit_button("Submit feedback")
+                if submitted:
+                    # wait so the recent-feedback list below includes this row on the rerun
+                    save_feedback(name, screened_jd_text, rating, comments, wait=True)
+                    st.success("Feedback saved")
+
+if st.sidebar.checkbox("Show pipeline metrics", value=False):
+    snap = metrics.REGISTRY.snapshot()
+    st.sidebar.header("Pipeline metrics")
+    if snap['stages']:
+        st.sidebar.table([{'stage': stage, 'n': s['count'], 'p50 ms': round(s['p50'] * 1000, 1), 'p95 ms': round(s['p95'] * 1000, 1)} for stage, s in snap['stages'].items()])
+    for name, value in sorted(snap['counters'].items()):
+        st.sidebar.write(f"{name}: {value}")
+    for name, value in sorted(snap['rates'].items()):
+        st.sidebar.write(f"{name}: {value * 100:.0f}%")
+
+if warmup.ENABLED:
+    warm = warmup.status()
+    if warm['ready']:
+        st.sidebar.caption(f"Models and parsers ready ({warm['elapsed']:.1f}s warm-up)")
+    else:
+        loading = ', '.join(k for k, v in warm['components'].items() if v in ('pending', 'loading'))
+        st.sidebar.caption(f"Warming up in the background: {loading or 'starting'}. Screening works now but the first run may be slower.")
 
 st.sidebar.header("About")
 st.sidebar.write("This MVP demonstrates core ideas: parsing, embedding-based matching, and an attractive UI. Extend with bias checks, explainability, and deployment.")
@@ -110,3 +251,6 @@ for ts, cand, jd, rating, comments in list_feedback(10):
     st.sidebar.markdown(f"**{cand}** — {rating}/5 — {ts.split('T')[0]}")
     if comments:
         st.sidebar.markdown(f"_{comments[:120]}_")
+
+# started last so the first page is rendered before heavy dependencies are loaded
+_start_warmup()
@@ -0,0 +1,145 @@
+"""Compare the streaming DOCX extractor with the python-docx path.
+
+Examples:
+    python benchmarks/bench_docx.py --n 500
+    python benchmarks/bench_docx.py --n 2000 --layouts template --memory
+
+For each layout of the synthetic corpus (see `corpus.py`: 'plain' is one paragraph per line,
+'template' puts the name in the headers, skills in a table and education in a text box) both
+extractors are timed over every document, then over one large document holding the whole
+corpus (one paragraph per source line). The report shows ms per document, the share of the
+source words each extractor recovered and, with --memory, how much extracting the large document
+raises peak RSS in a fresh child process (python-docx allocates in lxml, which tracemalloc cannot
+see).
+"""
+import argparse
+import io
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ensure project root and this directory are on sys.path
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import corpus  # noqa: E402
+import docx_stream  # noqa: E402
+import resume_parser  # noqa: E402
+
+LAYOUTS = {'plain': 'docx', 'template': 'docx_template'}
+_WORD_RE = re.compile(r'\w+')
+
+
+def _python_docx(fp):
+    return '\n'.join(p.text for p in resume_parser._docx_document(fp).paragraphs)
+
+
+EXTRACTORS = {
+    'python-docx': _python_docx,
+    'stream': docx_stream.extract_text,
+}
+
+
+def _recall(source, extracted):
+    """Fraction of the source's distinct words present in the extracted text."""
+    want = set(_WORD_RE.findall(source.lower()))
+    got = set(_WORD_RE.findall(extracted.lower()))
+    return len(want & got) / max(1, len(want))
+
+
+def _rss_kib():
+    """Peak RSS of this process in KiB.
+
+    VmHWM starts fresh after exec; ru_maxrss (the fallback) carries the parent's peak into a
+    child on Linux, which hides the growth when the parent is larger.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _rss_child(name, path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    extract = EXTRACTORS[name]
+    extract(io.BytesIO(corpus.to_docx_bytes('warm up')))
+    before = _rss_kib()
+    extract(io.BytesIO(data))
+    print(_rss_kib() - before)
+
+
+def peak_rss_kib(name, data):
+    """Peak RSS growth (KiB) while `name` extracts `data`, measured in a fresh interpreter."""
+    with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
+        f.write(data)
+    try:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--rss-child', name, f.name],
+                             check=True, capture_output=True, text=True)
+        return float(out.stdout.strip())
+    finally:
+        os.unlink(f.name)
+
+
+def run(layouts=('plain', 'template'), n=200, words=150, repeat=3, memory=False, log=None):
+    """Return {'layout/extractor': {'per_doc_ms', 'recall', 'large_doc_ms', 'peak_rss_kib'}}.
+
+    peak_rss_kib is None unless `memory` is set.
+    """
+    results = {}
+    for layout in layouts:
+        docs = corpus.generate_corpus(n, fmt=LAYOUTS[layout], words=words)
+        large = corpus.RENDERERS[LAYOUTS[layout]]('\n'.join(src for _, _, src in docs))
+        for name, extract in EXTRACTORS.items():
+            extract(io.BytesIO(docs[0][1]))  # warm-up: imports and parser setup
+            best = None
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                texts = [extract(io.BytesIO(data)) for _, data, _ in docs]
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            recall = sum(_recall(src, text) for (_, _, src), text in zip(docs, texts)) / len(docs)
+            start = time.perf_counter()
+            extract(io.BytesIO(large))
+            large_ms = (time.perf_counter() - start) * 1000.0
+            r = results[f'{layout}/{name}'] = {
+                'per_doc_ms': best * 1000.0 / n,
+                'recall': recall,
+                'large_doc_ms': large_ms,
+                'peak_rss_kib': peak_rss_kib(name, large) if memory else None,
+            }
+            if log:
+                rss = '' if r['peak_rss_kib'] is None else f"  peak RSS +{r['peak_rss_kib']:.0f} KiB"
+                log(f"{layout + '/' + name:<22} {r['per_doc_ms']:8.3f} ms/doc  recall={r['recall']:.3f}  "
+                    f"large ({len(large) // 1024} KiB) {large_ms:8.1f} ms{rss}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark DOCX text extraction.')
+    parser.add_argument('--n', type=int, default=200, help='documents per layout')
+    parser.add_argument('--words', type=int, default=150, help='approximate words per document')
+    parser.add_argument('--layouts', default=','.join(LAYOUTS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--memory', action='store_true', help='also measure peak RSS on the largest document')
+    parser.add_argument('--rss-child', nargs=2, metavar=('EXTRACTOR', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.rss_child:
+        _rss_child(*args.rss_child)
+        return 0
+    run([l for l in args.layouts.split(',') if l], n=args.n, words=args.words, repeat=args.repeat,
+        memory=args.memory, log=print)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
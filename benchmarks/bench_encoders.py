@@ -0,0 +1,111 @@
+"""Compare embedding backends on throughput and ranking agreement.
+
+Examples:
+    python benchmarks/bench_encoders.py --n 2000
+    python benchmarks/bench_encoders.py --encoders hashing,tfidf --reference hashing --n 5000
+
+Each backend from `matcher.available_encoders()` that loads is timed encoding a synthetic corpus
+(see `corpus.py`). For a handful of JDs the corpus is then ranked by cosine similarity, and each
+ranking is compared with the reference backend's (sentence-transformers when it is installed):
+mean top-k overlap and mean Spearman rank correlation.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure project root and this directory are on sys.path
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import corpus  # noqa: E402
+import matcher  # noqa: E402
+
+
+def _ranks(scores):
+    ranks = np.empty(len(scores), dtype=np.float64)
+    ranks[np.argsort(-scores, kind='stable')] = np.arange(len(scores))
+    return ranks
+
+
+def spearman(a, b):
+    ra, rb = _ranks(np.asarray(a)), _ranks(np.asarray(b))
+    if ra.std() == 0 or rb.std() == 0:
+        return 0.0
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def top_k_overlap(a, b, k):
+    k = min(k, len(a))
+    top_a = set(np.argsort(-np.asarray(a), kind='stable')[:k].tolist())
+    top_b = set(np.argsort(-np.asarray(b), kind='stable')[:k].tolist())
+    return len(top_a & top_b) / max(1, k)
+
+
+def _scores(encoder, texts, jds, batch_size):
+    start = time.perf_counter()
+    docs = matcher._normalize_rows(encoder.encode(texts, batch_size=batch_size))
+    elapsed = time.perf_counter() - start
+    queries = matcher._normalize_rows(encoder.encode(jds, batch_size=batch_size))
+    return queries @ docs.T, elapsed
+
+
+def run(encoders, reference, n=1000, n_jds=5, k=10, words=150, batch_size=64, log=None):
+    """Return {encoder: {'docs_per_s', 'dim', 'top_k_overlap', 'spearman'}} (agreement vs reference)."""
+    texts = [text for _, _, text in corpus.generate_corpus(n, fmt='txt', words=words)]
+    jds = corpus.generate_jds(n_jds)
+    fit_texts = texts[:min(len(texts), 2000)]
+
+    sims = {}
+    results = {}
+    for name in dict.fromkeys([reference] + list(encoders)):
+        try:
+            encoder = matcher.create_encoder(name)
+        except Exception as e:
+            if log:
+                log(f'{name:<22} unavailable: {type(e).__name__}: {e}')
+            continue
+        if hasattr(encoder, 'fit') and name == 'tfidf':
+            encoder.fit(fit_texts)
+        dim = np.asarray(encoder.encode(texts[:8], batch_size=batch_size)).shape[1]  # warm-up
+        sims[name], elapsed = _scores(encoder, texts, jds, batch_size)
+        results[name] = {'docs_per_s': n / elapsed if elapsed > 0 else float('inf'), 'dim': int(dim)}
+
+    ref = sims.get(reference)
+    for name, r in results.items():
+        if ref is None:
+            r['top_k_overlap'] = r['spearman'] = None
+        else:
+            r['top_k_overlap'] = float(np.mean([top_k_overlap(ref[j], sims[name][j], k) for j in range(len(jds))]))
+            r['spearman'] = float(np.mean([spearman(ref[j], sims[name][j]) for j in range(len(jds))]))
+        if log:
+            agree = ('n/a' if r['spearman'] is None
+                     else f"top-{k} overlap={r['top_k_overlap']:.2f}  spearman={r['spearman']:.2f}")
+            log(f"{name:<22} dim={r['dim']:<6} {r['docs_per_s']:>10.0f} docs/s  {agree}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark embedding backends.')
+    parser.add_argument('--encoders', default=','.join(matcher.available_encoders()))
+    parser.add_argument('--reference', default='sentence-transformers',
+                        help='backend whose rankings the others are compared with')
+    parser.add_argument('--n', type=int, default=1000, help='synthetic resumes to encode')
+    parser.add_argument('--jds', type=int, default=5)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    encoders = [e for e in args.encoders.split(',') if e]
+    results = run(encoders, args.reference, n=args.n, n_jds=args.jds, k=args.k,
+                  batch_size=args.batch_size, log=print)
+    if args.reference not in results and results:
+        print(f'reference {args.reference!r} unavailable; rerun with --reference {next(iter(results))}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""Synthetic resume / job-description corpus generator for benchmarks.
+
+Resumes are assembled from the structure of `data/samples` (name, experience bullets, skills,
+education) with randomised roles, companies and skills, padded to a target word count, and
+rendered as TXT, DOCX or PDF bytes. Generation is deterministic for a given seed.
+"""
+import io
+import os
+import random
+import zipfile
+
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'samples')
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'Dinesh', 'Eve', 'Farah', 'Gustavo', 'Hana', 'Ivan', 'Jia']
+LAST_NAMES = ['Example', 'Sample', 'Kumar', 'Nguyen', 'Okafor', 'Schmidt', 'Tanaka', 'Silva']
+ROLES = ['NLP Engineer', 'Backend Developer', 'Software Engineer', 'Data Analyst', 'ML Engineer',
+         'Data Engineer', 'DevOps Engineer', 'Frontend Developer']
+COMPANIES = ['ExampleAI', 'WebServ', 'DevCorp', 'DataCo', 'CloudNine', 'Streamly', 'Finlytics']
+SKILLS = ['Python', 'PyTorch', 'transformers', 'NLP', 'REST', 'Docker', 'pandas', 'Flask', 'SQL',
+          'Kubernetes', 'AWS', 'Spark', 'Airflow', 'React', 'TypeScript', 'Java', 'Spring', 'Go',
+          'PostgreSQL', 'Redis', 'Kafka', 'scikit-learn', 'TensorFlow', 'FastAPI', 'Terraform']
+VERBS = ['built', 'designed', 'maintained', 'scaled', 'migrated', 'optimised', 'automated', 'led']
+JD_VERBS = ['build', 'design', 'maintain', 'scale', 'migrate', 'optimise', 'automate', 'lead']
+OBJECTS = ['text classifiers', 'information extraction pipelines', 'REST APIs', 'microservices',
+           'ETL jobs', 'dashboards', 'recommendation models', 'data platforms', 'CI pipelines']
+EDUCATION = ['B.Sc. Computer Science', 'M.Sc. Data Science', 'B.Eng. Software Engineering', 'Ph.D. Statistics']
+
+
+def sample_texts():
+    """Return the text of the bundled sample resumes."""
+    out = []
+    if os.path.isdir(SAMPLES_DIR):
+        for name in sorted(os.listdir(SAMPLES_DIR)):
+            if name.endswith('.txt'):
+                with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+                    out.append(f.read())
+    return out
+
+
+def _sentence(rng):
+    skills = rng.sample(SKILLS, 3)
+    return f"{rng.choice(VERBS).capitalize()} {rng.choice(OBJECTS)} using {skills[0]}, {skills[1]} and {skills[2]}."
+
+
+def make_resume_text(rng, words=150):
+    """Return one synthetic resume of roughly `words` words."""
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", '', 'Experience']
+    year = rng.randint(2008, 2018)
+    for _ in range(rng.randint(2, 4)):
+        span = rng.randint(1, 4)
+        lines.append(f"- {rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({year}-{year + span}): {_sentence(rng)}")
+        year += span
+    lines += ['', 'Skills', ', '.join(rng.sample(SKILLS, rng.randint(5, 10))), '', 'Education', rng.choice(EDUCATION)]
+    text = '\n'.join(lines)
+    filler = []
+    while len(text.split()) + sum(len(s.split()) for s in filler) < words:
+        filler.append(_sentence(rng))
+    if filler:
+        text += '\n\nProjects\n' + ' '.join(filler)
+    return text
+
+
+def make_jd_text(rng, words=80):
+    """Return one synthetic job description of roughly `words` words."""
+    role = rng.choice(ROLES)
+    must = rng.sample(SKILLS, 5)
+    parts = [f"We are hiring a {role}.", f"Must know {', '.join(must[:-1])} and {must[-1]}."]
+    while sum(len(p.split()) for p in parts) < words:
+        parts.append(f"You will {rng.choice(JD_VERBS)} {rng.choice(OBJECTS)} with {rng.choice(SKILLS)}.")
+    return ' '.join(parts)
+
+
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def _docx_para(line):
+    from xml.sax.saxutils import escape
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+
+
+def _docx_template_body(lines):
+    """Body XML laid out like a resume template: skills in a table and education in a text box.
+
+    The text box is written the way Word writes it, as DrawingML (mc:Choice) with a VML copy
+    (mc:Fallback), so both copies hold the same paragraph.
+    """
+    out = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line == 'Skills' and i + 1 < len(lines):
+            cells = ''.join(f'<w:tc>{_docx_para(s.strip())}</w:tc>' for s in lines[i + 1].split(','))
+            out.append(_docx_para(line) + f'<w:tbl><w:tr>{cells}</w:tr></w:tbl>')
+            i += 2
+            continue
+        if line == 'Education' and i + 1 < len(lines):
+            box = f'<w:txbxContent>{_docx_para(lines[i + 1])}</w:txbxContent>'
+            out.append(
+                '<w:p><w:r><mc:AlternateContent>'
+                f'<mc:Choice Requires="wps"><w:drawing><wps:txbx>{box}</wps:txbx></w:drawing></mc:Choice>'
+                f'<mc:Fallback><w:pict><v:textbox>{box}</v:textbox></w:pict></mc:Fallback>'
+                f'</mc:AlternateContent><w:t>{line}</w:t></w:r></w:p>')
+            i += 2
+            continue
+        out.append(_docx_para(line))
+        i += 1
+    return ''.join(out)
+
+
+def to_docx_bytes(text, template=False):
+    """Render text as a minimal DOCX (one paragraph per line) without python-docx.
+
+    template=True moves the first line (the name) into the page headers and lays out the skills
+    and education sections as a table and a text box, which python-docx's `Document.paragraphs`
+    does not see.
+    """
+    lines = text.split('\n')
+    parts = {}
+    if template:
+        header = f'<w:hdr xmlns:w="{_W_NS}">{_docx_para(lines[0])}</w:hdr>'
+        # Word writes separate first-page and default headers, usually with the same content
+        parts['word/header1.xml'] = parts['word/header2.xml'] = header
+        body = _docx_template_body(lines[1:])
+    else:
+        body = ''.join(_docx_para(line) for line in lines)
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document xmlns:w="{_W_NS}"'
+                ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+                ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+                ' xmlns:v="urn:schemas-microsoft-com:vml">'
+                f'<w:body>{body}</w:body></w:document>')
+    content_types = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                     '<Default Extension="xml" ContentType="application/xml"/>'
+                     '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                     '</Types>')
+    rels = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+            '</Relationships>')
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', content_types)
+        zf.writestr('_rels/.rels', rels)
+        zf.writestr('word/document.xml', document)
+        for name, xml in parts.items():
+            zf.writestr(name, xml)
+    return buf.getvalue()
+
+
+def to_pdf_bytes(text, lines_per_page=50):
+    """Render text as a minimal text-based PDF (Helvetica, one line per text row)."""
+    def esc(s):
+        return s.encode('latin-1', 'replace').decode('latin-1').replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    # wrap long lines so they stay on the page
+    rows = []
+    for line in text.split('\n'):
+        while len(line) > 90:
+            cut = line.rfind(' ', 0, 90)
+            cut = cut if cut > 0 else 90
+            rows.append(line[:cut])
+            line = line[cut:].lstrip()
+        rows.append(line)
+    pages = [rows[i:i + lines_per_page] for i in range(0, len(rows), lines_per_page)] or [[]]
+
+    objects = []  # object bodies, 1-based ids
+    font_id = 3
+    page_ids = []
+    objects.append(None)  # 1: catalog
+    objects.append(None)  # 2: pages
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    for page in pages:
+        stream = 'BT /F1 10 Tf 50 780 Td 12 TL ' + ' '.join(f'({esc(r)}) Tj T*' for r in page) + ' ET'
+        data = stream.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(data) + data + b'\nendstream')
+        content_id = len(objects)
+        objects.append(('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                        f'/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>').encode('latin-1'))
+        page_ids.append(len(objects))
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    kids = ' '.join(f'{i} 0 R' for i in page_ids)
+    objects[1] = f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode('latin-1')
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % i + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for off in offsets:
+        out.write(b'%010d 00000 n \n' % off)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+RENDERERS = {
+    'txt': lambda text: text.encode('utf-8'),
+    'docx': to_docx_bytes,
+    'docx_template': lambda text: to_docx_bytes(text, template=True),
+    'pdf': to_pdf_bytes,
+}
+
+
+def generate_corpus(n, fmt='txt', words=150, seed=0):
+    """Return a list of (filename, bytes, text) tuples for `n` synthetic resumes in `fmt`."""
+    rng = random.Random(seed)
+    samples = sample_texts()
+    render = RENDERERS[fmt]
+    out = []
+    for i in range(n):
+        # every so often reuse a bundled sample verbatim so real layouts stay in the mix
+        if samples and i % 50 == 0:
+            text = samples[(i // 50) % len(samples)]
+        else:
+            text = make_resume_text(rng, words=words)
+        out.append((f'resume_{i:05d}.{fmt}', render(text), text))
+    return out
+
+
+def generate_jds(n, words=80, seed=1):
+    rng = random.Random(seed)
+    return [make_jd_text(rng, words=words) for _ in range(n)]
+
+
+def write_corpus(directory, n, fmt='txt', words=150, seed=0):
+    """Write a generated corpus to `directory` and return the file paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, data, _ in generate_corpus(n, fmt=fmt, words=words, seed=seed):
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Write a synthetic resume corpus to a directory.')
+    parser.add_argument('directory')
+    parser.add_argument('-n', type=int, default=100)
+    parser.add_argument('--format', choices=sorted(RENDERERS), default='txt')
+    parser.add_argument('--words', type=int, default=150)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(len(write_corpus(args.directory, args.n, fmt=args.format, words=args.words, seed=args.seed)), 'files written')
@@ -0,0 +1,218 @@
+"""Stage-by-stage screening benchmarks with JSON baselines and regression checks.
+
+Examples:
+    python benchmarks/run_bench.py --sizes 10,1000 --save benchmarks/baseline.json
+    python benchmarks/run_bench.py --sizes 10,1000 --compare benchmarks/baseline.json --threshold 0.25
+
+Each stage is timed separately on a synthetic corpus (see `corpus.py`) at every size; the best
+of --repeat runs is kept. --compare exits with status 1 if any stage's per-document time is
+more than --threshold (fractional) slower than the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Ensure project root and this directory are on sys.path
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import corpus  # noqa: E402
+
+
+class _Upload:
+    def __init__(self, name, data):
+        self.name = name
+        self._data = data
+
+    def read(self):
+        return self._data
+
+
+def _stage_extract(fmt):
+    def setup(n, words):
+        return [_Upload(name, data) for name, data, _ in corpus.generate_corpus(n, fmt=fmt, words=words)]
+
+    def run(files):
+        from resume_parser import extract_text_from_file
+        for f in files:
+            extract_text_from_file(f, cache=False)
+    return setup, run
+
+
+def _texts_and_jd(n, words):
+    texts = [text for _, _, text in corpus.generate_corpus(n, fmt='txt', words=words)]
+    return texts, corpus.generate_jds(1)[0]
+
+
+def _stage_keywords():
+    def run(data):
+        from matcher import extract_keywords
+        texts, _ = data
+        for t in texts:
+            extract_keywords(t, top_k=120)
+    return _texts_and_jd, run
+
+
+def _stage_match():
+    def run(data):
+        from matcher import match_with_weights
+        texts, jd = data
+        for t in texts:
+            match_with_weights(jd, {'text': t, 'meta': {}})
+    return _texts_and_jd, run
+
+
+def _stage_match_matrix(n_jds=10):
+    def setup(n, words):
+        texts, _ = _texts_and_jd(n, words)
+        return texts, corpus.generate_jds(n_jds)
+
+    def run(data):
+        from matcher import match_matrix
+        texts, jds = data
+        match_matrix(jds, ({'text': t, 'meta': {}} for t in texts), top_k=5)
+    return setup, run
+
+
+def _stage_explain():
+    def run(data):
+        from matcher import explain_match
+        texts, jd = data
+        for t in texts:
+            explain_match(jd, t, top_k=3)
+    return _texts_and_jd, run
+
+
+def _stage_highlight():
+    def run(data):
+        from matcher import extract_keywords
+        from ui_helpers import extract_snippets, get_matcher, highlight_text
+        texts, jd = data
+        keywords = get_matcher(extract_keywords(jd, top_k=8))
+        for t in texts:
+            for s in extract_snippets(t, keywords):
+                highlight_text(s, keywords)
+    return _texts_and_jd, run
+
+
+def _stage_feedback():
+    def setup(n, words):
+        return [(f'resume_{i:05d}.txt', corpus.generate_jds(1)[0], 1 + i % 5) for i in range(n)]
+
+    def run(rows):
+        from feedback import flush_feedback, save_feedback
+        for cand, jd, rating in rows:
+            save_feedback(cand, jd, rating, 'benchmark')
+        # time the database writes, not just queueing them
+        flush_feedback()
+    return setup, run
+
+
+STAGES = {
+    'extract_txt': _stage_extract('txt'),
+    'extract_docx': _stage_extract('docx'),
+    'extract_pdf': _stage_extract('pdf'),
+    'extract_keywords': _stage_keywords(),
+    'match_with_weights': _stage_match(),
+    'match_matrix_10jd': _stage_match_matrix(10),
+    'explain_match': _stage_explain(),
+    'highlight_snippets': _stage_highlight(),
+    'feedback_write': _stage_feedback(),
+}
+
+
+def run_benchmarks(stages, sizes, words=150, repeat=3, log=None):
+    """Return {'stage@size': {'stage', 'size', 'total_s', 'per_doc_ms', 'docs_per_s'}}."""
+    results = {}
+    for stage in stages:
+        setup, run = STAGES[stage]
+        # untimed warm-up so lazy imports and model loading don't count against the first size
+        run(setup(1, words))
+        for n in sizes:
+            data = setup(n, words)
+            best = None
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                run(data)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[f'{stage}@{n}'] = {
+                'stage': stage,
+                'size': n,
+                'total_s': best,
+                'per_doc_ms': best * 1000.0 / n,
+                'docs_per_s': n / best if best > 0 else float('inf'),
+            }
+            if log:
+                r = results[f'{stage}@{n}']
+                log(f"{stage:<20} n={n:<6} total={r['total_s']:.3f}s  {r['per_doc_ms']:.3f} ms/doc  {r['docs_per_s']:.0f} docs/s")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages for stages slower than baseline * (1 + threshold)."""
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get('results', {}).get(key)
+        if not base or base.get('per_doc_ms', 0) <= 0:
+            continue
+        ratio = r['per_doc_ms'] / base['per_doc_ms']
+        if ratio > 1.0 + threshold:
+            regressions.append(f"{key}: {r['per_doc_ms']:.3f} ms/doc vs baseline {base['per_doc_ms']:.3f} (+{(ratio - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the screening pipeline stage by stage.')
+    parser.add_argument('--stages', default=','.join(STAGES), help='comma-separated subset of: ' + ', '.join(STAGES))
+    parser.add_argument('--sizes', default='10,1000,10000', help='comma-separated document counts')
+    parser.add_argument('--words', type=int, default=150, help='approximate words per synthetic resume')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help='write results as a JSON baseline to this path')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed fractional slowdown per stage')
+    args = parser.parse_args(argv)
+
+    stages = [s for s in args.stages.split(',') if s]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+
+    # keep feedback writes away from the real database
+    tmpdir = tempfile.mkdtemp(prefix='resume-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'feedback.db')}"
+
+    results = run_benchmarks(stages, sizes, words=args.words, repeat=args.repeat, log=print)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'words': args.words,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for msg in regressions:
+            print('REGRESSION', msg)
+        if regressions:
+            return 1
+        print(f'no regressions beyond {args.threshold * 100:.0f}%')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
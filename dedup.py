@@ -0,0 +1,140 @@
+"""Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+Re-exports, PDF+DOCX pairs and lightly edited copies of one resume produce nearly identical
+extracted text. `cluster_near_duplicates` groups them so each cluster is scored and explained
+once:
+
+- each text becomes a set of word k-shingles (`shingle_size`, default 5 words);
+- a MinHash signature of `num_perm` values estimates Jaccard similarity between shingle sets;
+- signatures are split into `bands` bands; texts sharing any band bucket become candidate pairs,
+  so only colliding documents are compared instead of all pairs;
+- candidates whose estimated Jaccard similarity reaches `threshold` are merged (union-find).
+
+Configuration: RESUME_DEDUP_THRESHOLD (default 0.8).
+"""
+import os
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+
+DEFAULT_THRESHOLD = float(os.environ.get('RESUME_DEDUP_THRESHOLD', 0.8))
+
+_WORD_RE = re.compile(r'\w+')
+# Mersenne prime 2^31 - 1: (a * x + b) stays below 2^63 for 32-bit x, so uint64 never overflows
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def shingles(text, k=5):
+    """Return the set of k-word shingles of `text` (lower-cased, punctuation ignored)."""
+    words = _WORD_RE.findall((text or '').lower())
+    if not words:
+        return set()
+    if len(words) < k:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures with seeded universal hash permutations."""
+
+    def __init__(self, num_perm=128, shingle_size=5, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = int(num_perm)
+        self.shingle_size = int(shingle_size)
+        self._a = rng.randint(1, int(_PRIME), size=self.num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=self.num_perm).astype(np.uint64)
+
+    def signature(self, text):
+        """Return a uint32 signature, or None when the text has no words."""
+        sh = shingles(text, self.shingle_size)
+        if not sh:
+            return None
+        x = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in sh), dtype=np.uint64, count=len(sh))
+        x %= _PRIME
+        # (num_perm, n_shingles) hash table; the column minimum is the signature value
+        hashed = (self._a[:, None] * x[None, :] + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: the fraction of equal signature positions."""
+    return float(np.mean(sig_a == sig_b))
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures; `query` returns keys sharing at least one band bucket."""
+
+    def __init__(self, num_perm=128, bands=16):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def _band_keys(self, sig):
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key, sig):
+        for bucket, band in zip(self._buckets, self._band_keys(sig)):
+            bucket[band].append(key)
+
+    def query(self, sig):
+        found = []
+        seen = set()
+        for bucket, band in zip(self._buckets, self._band_keys(sig)):
+            for key in bucket.get(band, ()):
+                if key not in seen:
+                    seen.add(key)
+                    found.append(key)
+        return found
+
+
+def cluster_near_duplicates(texts, threshold=None, num_perm=128, bands=16, shingle_size=5):
+    """Group near-duplicate texts.
+
+    texts: dict {key: text} (text may be a `tokenizer.PreparedDocument`), in display order.
+    Returns a dict {key: representative_key}, where the representative is the first key of its
+    cluster in input order. Keys with empty text are their own cluster.
+    """
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+    hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+    index = LSHIndex(num_perm=num_perm, bands=bands)
+    order = list(texts)
+    position = {key: i for i, key in enumerate(order)}
+    parent = {key: key for key in order}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    signatures = {}
+    for key in order:
+        text = texts[key]
+        sig = hasher.signature(getattr(text, 'text', text))
+        if sig is None:
+            continue
+        for other in index.query(sig):
+            if similarity(sig, signatures[other]) >= threshold:
+                a, b = find(key), find(other)
+                if a != b:
+                    # the earlier upload stays the representative
+                    if position[a] < position[b]:
+                        parent[b] = a
+                    else:
+                        parent[a] = b
+        signatures[key] = sig
+        index.add(key, sig)
+    return {key: find(key) for key in order}
+
+
+def clusters(assignment):
+    """Turn {key: representative} into {representative: [keys in order]}."""
+    out = {}
+    for key, rep in assignment.items():
+        out.setdefault(rep, []).append(key)
+    return out
@@ -0,0 +1,118 @@
+"""Streaming DOCX text extraction straight from the zip, without the python-docx object model.
+
+python-docx builds the whole document tree and `Document.paragraphs` only covers top-level body
+paragraphs, so text in tables, text boxes, content controls and headers/footers (where many
+resume templates keep the name, contact line or skills) is dropped. Here each part is read with
+`ElementTree.iterparse` while it is decompressed, finished elements are cleared as the parse
+goes, and paragraphs are yielded one at a time:
+
+- header parts first, then `word/document.xml`, then footer parts;
+- every `w:p` becomes one paragraph, including table cells, content controls and text boxes
+  (a text box paragraph is yielded before the paragraph it is anchored in);
+- run content maps like python-docx: `w:t` text, `w:tab`/`w:ptab` -> tab, `w:br`/`w:cr` -> newline
+  (page and column breaks -> nothing), `w:noBreakHyphen` -> '-'; deleted text and field codes are
+  not `w:t` and are skipped;
+- `mc:Fallback` content (the VML copy of a DrawingML text box) is skipped so text boxes are not
+  duplicated, and header/footer paragraphs repeated across first/even/default parts are yielded once.
+
+`resume_parser` uses this for DOCX uploads and falls back to python-docx if it raises.
+"""
+import re
+import zipfile
+from xml.etree import ElementTree
+
+
+_W_NAMESPACES = (
+    'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'http://purl.oclc.org/ooxml/wordprocessingml/main',  # ISO/IEC 29500 strict
+)
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_W_TYPE = [f'{{{ns}}}type' for ns in _W_NAMESPACES]
+
+_P = {f'{{{ns}}}p' for ns in _W_NAMESPACES}
+_T = {f'{{{ns}}}t' for ns in _W_NAMESPACES}
+_TABS = {f'{{{ns}}}{name}' for ns in _W_NAMESPACES for name in ('tab', 'ptab')}
+_BREAKS = {f'{{{ns}}}cr' for ns in _W_NAMESPACES}
+_BR = {f'{{{ns}}}br' for ns in _W_NAMESPACES}
+_HYPHENS = {f'{{{ns}}}noBreakHyphen' for ns in _W_NAMESPACES}
+
+_PART_RE = re.compile(r'^word/(header|footer)(\d*)\.xml$')
+DOCUMENT_PART = 'word/document.xml'
+
+
+def iter_part_paragraphs(stream):
+    """Yield the text of each `w:p` in one WordprocessingML part, read incrementally from `stream`."""
+    stack = []       # open elements; finished children of shallow ones are cleared
+    paragraphs = []  # text buffers of open (possibly nested) paragraphs
+    skip = 0         # depth inside mc:Fallback
+    for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            stack.append(elem)
+            if tag == _MC_FALLBACK:
+                skip += 1
+            elif tag in _P and not skip:
+                paragraphs.append([])
+            continue
+
+        stack.pop()
+        if tag == _MC_FALLBACK:
+            skip -= 1
+        elif skip or not paragraphs:
+            pass
+        elif tag in _T:
+            if elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag in _TABS:
+            paragraphs[-1].append('\t')
+        elif tag in _BR:
+            if next((elem.get(a) for a in _W_TYPE if elem.get(a)), 'textWrapping') == 'textWrapping':
+                paragraphs[-1].append('\n')
+        elif tag in _BREAKS:
+            paragraphs[-1].append('\n')
+        elif tag in _HYPHENS:
+            paragraphs[-1].append('-')
+        elif tag in _P:
+            yield ''.join(paragraphs.pop())
+        # keep memory flat: drop finished children of the root and body-level containers
+        if len(stack) <= 2 and stack:
+            stack[-1].clear()
+
+
+def _part_order(names):
+    headers, footers = [], []
+    for name in names:
+        m = _PART_RE.match(name)
+        if m:
+            (headers if m.group(1) == 'header' else footers).append((int(m.group(2) or 0), name))
+    return [n for _, n in sorted(headers)], [n for _, n in sorted(footers)]
+
+
+def iter_paragraphs(fp):
+    """Yield paragraph texts of a DOCX file object: headers, body (with tables and text boxes), footers.
+
+    Raises zipfile.BadZipFile, KeyError (no word/document.xml) or ElementTree.ParseError for
+    input that is not a readable DOCX.
+    """
+    with zipfile.ZipFile(fp) as zf:
+        headers, footers = _part_order(zf.namelist())
+        for group in (headers, [DOCUMENT_PART], footers):
+            seen = set()
+            parts = set()
+            for name in group:
+                info = zf.getinfo(name)
+                if (info.CRC, info.file_size) in parts:
+                    continue  # byte-identical copy of an earlier header/footer part
+                parts.add((info.CRC, info.file_size))
+                with zf.open(name) as part:
+                    for text in iter_part_paragraphs(part):
+                        if name != DOCUMENT_PART:
+                            if not text.strip() or text in seen:
+                                continue
+                            seen.add(text)
+                        yield text
+
+
+def extract_text(fp):
+    """All paragraph texts of a DOCX file object joined with newlines."""
+    return '\n'.join(iter_paragraphs(fp))
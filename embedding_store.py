@@ -0,0 +1,253 @@
+import importlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+import matcher
+
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matrix-vector product during exact search; bounds temporary memory
+_SEARCH_CHUNK_ROWS = 65536
+
+# On-disk row formats: numpy dtype, file name and the factor stored values are multiplied by.
+# Rows are unit vectors, so int8 stores each component scaled to [-127, 127].
+_DTYPES = {
+    'float32': (np.float32, 'vectors.f32', 1.0),
+    'float16': (np.float16, 'vectors.f16', 1.0),
+    'int8': (np.int8, 'vectors.i8', 127.0),
+}
+
+
+def _normalize(mat):
+    mat = np.asarray(mat, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat[None, :]
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return np.divide(mat, norms, out=np.zeros_like(mat), where=norms != 0)
+
+
+class EmbeddingStore:
+    """Persistent store of resume embeddings with top-k search against a job description.
+
+    Layout inside `directory`:
+    - `vectors.f32`: row-major float32 matrix of L2-normalised embeddings, memory-mapped for search
+      (`vectors.f16` / `vectors.i8` when created with dtype='float16' / 'int8' to halve or quarter
+      the footprint; scores are computed in float32 either way)
+    - `index.json`: sidecar with the vector dimension, storage dtype and, per row, the resume id
+      and metadata
+
+    Deleted rows are tombstoned in the sidecar and skipped at query time until `compact()` rewrites
+    the matrix. Only the JD is encoded at query time.
+    """
+
+    SIDECAR = 'index.json'
+
+    def __init__(self, directory, model=None, dtype=None):
+        self.directory = directory
+        self._model = model
+        self._mmap = None
+        self._ann = None
+        os.makedirs(directory, exist_ok=True)
+        self.dim = None
+        # an existing store keeps the dtype it was created with
+        self.dtype = dtype or os.environ.get('RESUME_EMBEDDING_DTYPE', 'float32')
+        self._rows = []  # per row: {'id', 'meta'} or None when deleted
+        self._row_of = {}
+        self._load()
+        if self.dtype not in _DTYPES:
+            raise ValueError(f"dtype must be one of {', '.join(_DTYPES)}")
+
+    # -- persistence -------------------------------------------------------------------------
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.directory, _DTYPES[self.dtype][1])
+
+    def _encode_rows(self, vectors):
+        np_dtype, _, scale = _DTYPES[self.dtype]
+        if scale != 1.0:
+            vectors = np.clip(np.rint(vectors * scale), -scale, scale)
+        return np.ascontiguousarray(vectors, dtype=np_dtype)
+
+    def _decode_rows(self, rows):
+        scale = _DTYPES[self.dtype][2]
+        rows = np.asarray(rows, dtype=np.float32)
+        return rows / scale if scale != 1.0 else rows
+
+    @property
+    def _sidecar_path(self):
+        return os.path.join(self.directory, self.SIDECAR)
+
+    def _load(self):
+        try:
+            with open(self._sidecar_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.dim = state.get('dim')
+        self.dtype = state.get('dtype', 'float32')
+        self._rows = state.get('rows', [])
+        self._row_of = {r['id']: i for i, r in enumerate(self._rows) if r is not None}
+
+    def _save(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'dim': self.dim, 'dtype': self.dtype, 'rows': self._rows}, f)
+        os.replace(tmp_path, self._sidecar_path)
+
+    def _matrix(self):
+        """Return the memory-mapped (rows, dim) matrix, or None if the store is empty."""
+        if not self._rows or not self.dim:
+            return None
+        if self._mmap is None or self._mmap.shape[0] != len(self._rows):
+            self._mmap = np.memmap(self._vectors_path, dtype=_DTYPES[self.dtype][0], mode='r',
+                                   shape=(len(self._rows), self.dim))
+        return self._mmap
+
+    # -- mutation ----------------------------------------------------------------------------
+
+    def _get_model(self):
+        if self._model is None:
+            self._model = matcher._get_model()
+        return self._model
+
+    def add(self, ids, resumes, metas=None, batch_size=32):
+        """Encode and add resumes (text or `extract_text_from_file` dicts) under the given ids."""
+        texts = [matcher._split_resume(r)[0] for r in resumes]
+        if not texts:
+            return
+        vectors = self._get_model().encode(texts, batch_size=batch_size)
+        self.add_vectors(ids, vectors, metas)
+
+    def add_vectors(self, ids, vectors, metas=None):
+        """Add precomputed embeddings. Re-adding an existing id replaces its previous row."""
+        ids = list(ids)
+        vectors = _normalize(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError('ids and vectors must have the same length')
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f'expected {self.dim}-dimensional vectors, got {vectors.shape[1]}')
+        metas = list(metas) if metas is not None else [{} for _ in ids]
+
+        self._mmap = None
+        expected = len(self._rows) * self.dim * np.dtype(_DTYPES[self.dtype][0]).itemsize
+        with open(self._vectors_path, 'ab') as f:
+            # drop rows appended after the last sidecar save (a crash between write and _save)
+            if f.tell() != expected:
+                f.truncate(expected)
+            f.write(self._encode_rows(vectors).tobytes())
+        for rid, meta in zip(ids, metas):
+            old = self._row_of.get(rid)
+            if old is not None:
+                self._rows[old] = None
+            self._row_of[rid] = len(self._rows)
+            self._rows.append({'id': rid, 'meta': meta or {}})
+        self._ann = None
+        self._save()
+
+    def delete(self, ids):
+        """Tombstone the given ids; returns how many were removed."""
+        removed = 0
+        for rid in ids:
+            row = self._row_of.pop(rid, None)
+            if row is not None:
+                self._rows[row] = None
+                removed += 1
+        if removed:
+            self._ann = None
+            self._save()
+        return removed
+
+    def compact(self):
+        """Rewrite the matrix without tombstoned rows."""
+        mat = self._matrix()
+        live = [i for i, r in enumerate(self._rows) if r is not None]
+        if mat is None or len(live) == len(self._rows):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            for start in range(0, len(live), _SEARCH_CHUNK_ROWS):
+                f.write(np.ascontiguousarray(mat[live[start:start + _SEARCH_CHUNK_ROWS]]).tobytes())
+        self._mmap = None
+        os.replace(tmp_path, self._vectors_path)
+        self._rows = [self._rows[i] for i in live]
+        self._row_of = {r['id']: i for i, r in enumerate(self._rows)}
+        self._ann = None
+        self._save()
+
+    def __len__(self):
+        return len(self._row_of)
+
+    # -- search ------------------------------------------------------------------------------
+
+    def build_ann(self, hnsw_m=32):
+        """Build an approximate HNSW index with faiss (if installed) for very large pools.
+
+        Returns True if the index was built; searches fall back to exact scoring otherwise.
+        """
+        mat = self._matrix()
+        if mat is None:
+            return False
+        try:
+            faiss = importlib.import_module('faiss')
+        except Exception:
+            logger.debug('faiss not available; using exact search')
+            return False
+        index = faiss.IndexHNSWFlat(self.dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        for start in range(0, mat.shape[0], _SEARCH_CHUNK_ROWS):
+            index.add(np.ascontiguousarray(self._decode_rows(mat[start:start + _SEARCH_CHUNK_ROWS])))
+        self._ann = index
+        return True
+
+    def search(self, jd_text, k=10, approximate=False):
+        """Return the top-k stored resumes for a JD as [{'id', 'score', 'meta'}], best first."""
+        query = _normalize(self._get_model().encode([jd_text]))[0]
+        return self.search_vector(query, k=k, approximate=approximate)
+
+    def search_vector(self, query, k=10, approximate=False):
+        mat = self._matrix()
+        if mat is None or k <= 0 or not self._row_of:
+            return []
+        query = _normalize(query)[0]
+
+        if approximate and self._ann is not None:
+            # over-fetch so tombstoned rows can be dropped and still leave k results
+            fetch = min(mat.shape[0], k + (len(self._rows) - len(self._row_of)))
+            scores, rows = self._ann.search(query[None, :], fetch)
+            pairs = [(float(s), int(r)) for s, r in zip(scores[0], rows[0]) if r >= 0]
+        else:
+            pairs = self._exact_top_k(mat, query, k)
+
+        out = []
+        for score, row in pairs:
+            entry = self._rows[row]
+            if entry is None:
+                continue
+            out.append({'id': entry['id'], 'score': score, 'meta': entry['meta']})
+            if len(out) >= k:
+                break
+        return out
+
+    def _exact_top_k(self, mat, query, k):
+        alive = np.fromiter((r is not None for r in self._rows), dtype=bool, count=len(self._rows))
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, mat.shape[0], _SEARCH_CHUNK_ROWS):
+            chunk = self._decode_rows(mat[start:start + _SEARCH_CHUNK_ROWS])
+            scores = chunk @ query
+            scores[~alive[start:start + len(chunk)]] = -np.inf
+            scores = np.concatenate([best_scores, scores])
+            rows = np.concatenate([best_rows, np.arange(start, start + len(chunk))])
+            if len(scores) > k:
+                keep = np.argpartition(-scores, k - 1)[:k]
+                scores, rows = scores[keep], rows[keep]
+            best_scores, best_rows = scores, rows
+        order = np.argsort(-best_scores, kind='stable')
+        return [(float(best_scores[i]), int(best_rows[i])) for i in order if np.isfinite(best_scores[i])]
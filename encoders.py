@@ -0,0 +1,111 @@
+"""CPU-fast text encoders that need no model download.
+
+`HashingEncoder` turns text into hashed word/bigram TF-IDF vectors with scikit-learn and can
+optionally reduce them with truncated SVD (LSA). It exposes the same `encode(texts, batch_size)`
+interface as a sentence-transformers model, so `matcher` can use it as an embedding backend
+(`RESUME_ENCODER=hashing` or `tfidf`).
+
+Without fitting, term weights are sublinear term frequencies (stateless, so every process agrees).
+`fit(corpus)` learns IDF weights and, if `svd_components` is set, the SVD projection; `save`/`load`
+persist the fitted state so all workers of a deployment share it.
+"""
+import pickle
+
+import numpy as np
+
+
+class HashingEncoder:
+    """Hashed TF-IDF (+ optional SVD) document encoder with a sentence-transformers-style API."""
+
+    def __init__(self, n_features=2 ** 12, ngram_range=(1, 2), svd_components=None):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.n_features = int(n_features)
+        self.ngram_range = tuple(ngram_range)
+        self.svd_components = svd_components
+        self._vectorizer = HashingVectorizer(n_features=self.n_features, ngram_range=self.ngram_range,
+                                             alternate_sign=False, norm=None, stop_words='english',
+                                             dtype=np.float32)
+        self._tfidf = None
+        self._svd = None
+
+    @property
+    def dim(self):
+        return self._svd.n_components if self._svd is not None else self.n_features
+
+    def fit(self, texts):
+        """Learn IDF weights (and the SVD projection, if configured) from a corpus."""
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfTransformer
+
+        counts = self._vectorizer.transform(list(texts))
+        self._tfidf = TfidfTransformer(sublinear_tf=True).fit(counts)
+        if self.svd_components:
+            weighted = self._tfidf.transform(counts)
+            k = min(int(self.svd_components), weighted.shape[1] - 1, max(1, weighted.shape[0] - 1))
+            self._svd = TruncatedSVD(n_components=k, random_state=0).fit(weighted)
+        return self
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        """Return an (n, dim) float32 matrix of L2-normalised vectors.
+
+        `batch_size` bounds how many documents are densified at once.
+        """
+        from sklearn.preprocessing import normalize
+
+        texts = list(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        step = max(1, int(batch_size))
+        for start in range(0, len(texts), step):
+            x = self._vectorizer.transform(texts[start:start + step])
+            if self._tfidf is not None:
+                x = self._tfidf.transform(x)
+            else:
+                x.data = np.log1p(x.data)
+            if self._svd is not None:
+                x = self._svd.transform(x)
+            else:
+                x = normalize(x).toarray()
+            out[start:start + step] = normalize(np.asarray(x, dtype=np.float32))
+        return out
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump({'n_features': self.n_features, 'ngram_range': self.ngram_range,
+                         'svd_components': self.svd_components, 'tfidf': self._tfidf, 'svd': self._svd}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        enc = cls(n_features=state['n_features'], ngram_range=state['ngram_range'],
+                  svd_components=state['svd_components'])
+        enc._tfidf = state['tfidf']
+        enc._svd = state['svd']
+        return enc
+
+
+if __name__ == '__main__':
+    import argparse
+    import glob
+    import os
+
+    parser = argparse.ArgumentParser(description='Fit a HashingEncoder on a resume corpus and save its state.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    fit_p = sub.add_parser('fit', help='learn IDF weights (and SVD) from text/PDF/DOCX files')
+    fit_p.add_argument('corpus', help='directory of resumes')
+    fit_p.add_argument('out', help='output path for RESUME_ENCODER_STATE')
+    fit_p.add_argument('--features', type=int, default=2 ** 12)
+    fit_p.add_argument('--svd', type=int, default=256, help='SVD components (0 to disable)')
+    args = parser.parse_args()
+
+    from resume_parser import extract_text_from_file
+
+    texts = []
+    for path in sorted(glob.glob(os.path.join(args.corpus, '**', '*'), recursive=True)):
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                texts.append(extract_text_from_file(f)['text'])
+    enc = HashingEncoder(n_features=args.features, svd_components=args.svd or None).fit(texts)
+    enc.save(args.out)
+    print(f'fitted on {len(texts)} documents, dim={enc.dim} -> {args.out}')
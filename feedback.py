@@ -1,76 +1,317 @@
+import atexit
+import hashlib
+import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
-from sqlalchemy import create_engine, Table, Column, Integer, String, MetaData, select
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import create_engine, event, inspect, text, Table, Column, Index, Integer, String, MetaData, select
+from sqlalchemy.exc import IntegrityError, OperationalError
 
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
+# Connection pool settings for server databases (ignored for SQLite)
+POOL_SIZE = int(os.environ.get('FEEDBACK_POOL_SIZE', 5))
+MAX_OVERFLOW = int(os.environ.get('FEEDBACK_MAX_OVERFLOW', 10))
+POOL_RECYCLE = int(os.environ.get('FEEDBACK_POOL_RECYCLE', 1800))
+
+# Opt-in write-behind queue: rows are inserted in batches of up to BATCH_SIZE, at most
+# FLUSH_INTERVAL seconds late. Off by default so a save is visible to the next read.
+WRITE_BEHIND = os.environ.get('FEEDBACK_WRITE_BEHIND', '0') in ('1', 'true', 'True')
+BATCH_SIZE = int(os.environ.get('FEEDBACK_BATCH_SIZE', 100))
+FLUSH_INTERVAL = float(os.environ.get('FEEDBACK_FLUSH_INTERVAL', 0.5))
+
 
 def _get_engine():
     """Create a SQLAlchemy engine. If DATABASE_URL is not set, fall back to a local SQLite file."""
+    if DATABASE_URL and not DATABASE_URL.startswith('sqlite'):
+        return create_engine(DATABASE_URL, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW,
+                             pool_pre_ping=True, pool_recycle=POOL_RECYCLE)
     if DATABASE_URL:
-        return create_engine(DATABASE_URL, connect_args={})
-    # fallback to SQLite file in data/
-    db_path = os.path.join(os.path.dirname(__file__), 'data', 'feedback.db')
-    d = os.path.dirname(db_path)
-    if not os.path.exists(d):
-        os.makedirs(d, exist_ok=True)
-    return create_engine(f'sqlite:///{db_path}', connect_args={})
+        engine = create_engine(DATABASE_URL, connect_args={'check_same_thread': False})
+    else:
+        # fallback to SQLite file in data/
+        db_path = os.path.join(os.path.dirname(__file__), 'data', 'feedback.db')
+        d = os.path.dirname(db_path)
+        if not os.path.exists(d):
+            os.makedirs(d, exist_ok=True)
+        engine = create_engine(f'sqlite:///{db_path}', connect_args={'check_same_thread': False})
+
+    @event.listens_for(engine, 'connect')
+    def _sqlite_pragmas(dbapi_conn, _):
+        # WAL lets readers proceed while the write-behind thread commits a batch
+        cur = dbapi_conn.cursor()
+        try:
+            cur.execute('PRAGMA journal_mode=WAL')
+            cur.execute('PRAGMA synchronous=NORMAL')
+        finally:
+            cur.close()
+    return engine
 
 
 _engine = _get_engine()
 _metadata = MetaData()
 
+jd_table = Table(
+    'jd', _metadata,
+    Column('jd_hash', String(64), primary_key=True),
+    Column('text', String),
+    Column('created', String),
+)
+
 feedback_table = Table(
     'feedback', _metadata,
     Column('id', Integer, primary_key=True, autoincrement=True),
     Column('timestamp', String),
     Column('candidate', String),
-    Column('jd', String),
+    # legacy rows stored the JD text inline; new rows reference jd.jd_hash instead
+    Column('jd', String, nullable=True),
+    Column('jd_hash', String(64), nullable=True),
     Column('rating', Integer),
     Column('comments', String),
+    Index('ix_feedback_candidate_timestamp', 'candidate', 'timestamp'),
+    Index('ix_feedback_timestamp', 'timestamp'),
+    Index('ix_feedback_jd_hash', 'jd_hash'),
 )
 
+schema_version_table = Table(
+    'schema_version', _metadata,
+    Column('version', Integer, primary_key=True),
+)
+
+
+def _jd_hash(jd):
+    return hashlib.sha256((jd or '').encode('utf-8')).hexdigest()
+
+
+def _migration_1(conn):
+    """Move inline JD text into the deduplicated `jd` table and add the feedback indexes."""
+    columns = {c['name'] for c in inspect(conn).get_columns('feedback')}
+    if 'jd_hash' not in columns:
+        conn.execute(text('ALTER TABLE feedback ADD COLUMN jd_hash VARCHAR(64)'))
+    legacy = conn.execute(
+        select(feedback_table.c.jd).where(feedback_table.c.jd_hash.is_(None)).distinct()
+    ).fetchall()
+    for (jd,) in legacy:
+        h = _jd_hash(jd)
+        if conn.execute(select(jd_table.c.jd_hash).where(jd_table.c.jd_hash == h)).first() is None:
+            conn.execute(jd_table.insert().values(jd_hash=h, text=jd, created=datetime.utcnow().isoformat()))
+        conn.execute(feedback_table.update().where(feedback_table.c.jd_hash.is_(None))
+                     .where(feedback_table.c.jd == jd).values(jd_hash=h, jd=None))
+    for index in feedback_table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+# Ordered migrations; the schema version is the number of migrations applied
+_MIGRATIONS = [_migration_1]
+
+_db_ready = False
+_db_lock = threading.Lock()
+
 
 def _ensure_db():
-    try:
-        _metadata.create_all(_engine)
-    except OperationalError:
-        # if creation fails, log and continue; higher layers will see errors on use
-        pass
+    """Create tables and apply pending migrations once per process."""
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_lock:
+        if _db_ready:
+            return
+        try:
+            _metadata.create_all(_engine)
+            with _engine.begin() as conn:
+                current = conn.execute(select(schema_version_table.c.version)
+                                       .order_by(schema_version_table.c.version.desc())).first()
+                current = current[0] if current else 0
+                for version, migration in enumerate(_MIGRATIONS[current:], start=current + 1):
+                    migration(conn)
+                    conn.execute(schema_version_table.insert().values(version=version))
+            _db_ready = True
+        except IntegrityError:
+            # another process recorded the same schema version first; it has run the migrations
+            _db_ready = True
+        except OperationalError:
+            # if creation fails, log and continue; higher layers will see errors on use
+            logger.exception('Feedback schema setup failed')
+
+
+_known_jd_hashes = set()
+
+
+def _insert_ignore_duplicates(table):
+    # another process may insert the same JD between our lookup and insert
+    dialect = _engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert(table).on_conflict_do_nothing()
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert(table).on_conflict_do_nothing()
+    return table.insert()
+
+
+def _store_jds(conn, jds):
+    """Insert JD texts not yet in the `jd` table; returns ({text: hash}, hashes to mark as known).
 
+    The caller adds the second value to `_known_jd_hashes` only after the transaction commits, so a
+    rolled-back insert never leaves a hash marked known without its `jd` row.
+    """
+    hashes = {jd: _jd_hash(jd) for jd in jds}
+    unknown = {h: jd for jd, h in hashes.items() if h not in _known_jd_hashes}
+    if unknown:
+        existing = {r[0] for r in conn.execute(select(jd_table.c.jd_hash).where(jd_table.c.jd_hash.in_(list(unknown))))}
+        now = datetime.utcnow().isoformat()
+        new = [{'jd_hash': h, 'text': jd, 'created': now} for h, jd in unknown.items() if h not in existing]
+        if new:
+            conn.execute(_insert_ignore_duplicates(jd_table), new)
+    return hashes, set(unknown)
 
-def save_feedback(candidate, jd, rating, comments):
+
+def _insert_rows(rows):
+    """Insert feedback rows (dicts with candidate/jd/rating/comments/timestamp) in one transaction."""
     _ensure_db()
-    ins = feedback_table.insert().values(
-        timestamp=datetime.utcnow().isoformat(),
-        candidate=candidate,
-        jd=jd,
-        rating=rating,
-        comments=comments,
-    )
-    conn = _engine.connect()
-    try:
-        conn.execute(ins)
-        conn.commit()
-    finally:
-        conn.close()
+    with _engine.begin() as conn:
+        hashes, stored = _store_jds(conn, {r['jd'] for r in rows})
+        conn.execute(feedback_table.insert(), [
+            {'timestamp': r['timestamp'], 'candidate': r['candidate'], 'jd': None, 'jd_hash': hashes[r['jd']],
+             'rating': r['rating'], 'comments': r['comments']}
+            for r in rows
+        ])
+    _known_jd_hashes.update(stored)
 
 
-def list_feedback(limit=50):
+class _WriteBehind:
+    """Background thread that batches queued feedback rows into multi-row inserts."""
+
+    def __init__(self, batch_size=BATCH_SIZE, interval=FLUSH_INTERVAL):
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._error = None  # first failed batch since the last flush
+
+    def put(self, row):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='feedback-writer', daemon=True)
+                self._thread.start()
+        self._queue.put(row)
+
+    def flush(self):
+        """Block until every queued row has been written; re-raise the error of a failed batch.
+
+        A marker is queued behind the pending rows so the writer commits its batch right away
+        instead of waiting out `interval`.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            rows = [] if item is _FLUSH else [item]
+            markers = 1 - len(rows)
+            deadline = time.monotonic() + self.interval
+            while not markers and len(rows) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _FLUSH:
+                    markers += 1
+                else:
+                    rows.append(item)
+            try:
+                if rows:
+                    _insert_rows(rows)
+            except Exception as e:
+                logger.exception('Dropping %d feedback rows after a failed batch insert', len(rows))
+                with self._lock:
+                    self._error = self._error or e
+            finally:
+                for _ in range(len(rows) + markers):
+                    self._queue.task_done()
+
+
+_FLUSH = object()
+
+
+_writer = _WriteBehind()
+atexit.register(_writer.flush)
+
+
+def save_feedback(candidate, jd, rating, comments, wait=False):
+    """Record feedback. With write-behind enabled the row is queued and inserted in a batch;
+    pass wait=True (or call `flush_feedback`) to block until it is committed. Either raises if
+    a queued batch failed to insert."""
+    row = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'candidate': candidate,
+        'jd': jd,
+        'rating': rating,
+        'comments': comments,
+    }
+    if not WRITE_BEHIND:
+        _insert_rows([row])
+        return
+    _writer.put(row)
+    if wait:
+        _writer.flush()
+
+
+def flush_feedback():
+    _writer.flush()
+
+
+def list_feedback_page(limit=50, before_id=None, candidate=None):
+    """Return (rows, next_before_id) using keyset pagination, newest first.
+
+    With FEEDBACK_WRITE_BEHIND=1, reads do not wait for the queue; rows saved without
+    wait=True appear once their batch is committed (at most FLUSH_INTERVAL seconds later).
+
+    rows are dicts with id, timestamp, candidate, jd, rating, comments. Pass next_before_id
+    back as before_id for the next page; it is None on the last page.
+    """
     _ensure_db()
-    sel = select([
+    sel = select(
+        feedback_table.c.id,
         feedback_table.c.timestamp,
         feedback_table.c.candidate,
+        jd_table.c.text,
         feedback_table.c.jd,
         feedback_table.c.rating,
         feedback_table.c.comments,
-    ]).order_by(feedback_table.c.id.desc()).limit(limit)
-    conn = _engine.connect()
-    try:
-        rows = conn.execute(sel).fetchall()
-        return rows
-    finally:
-        conn.close()
+    ).select_from(
+        feedback_table.outerjoin(jd_table, feedback_table.c.jd_hash == jd_table.c.jd_hash)
+    ).order_by(feedback_table.c.id.desc()).limit(limit)
+    if before_id is not None:
+        sel = sel.where(feedback_table.c.id < before_id)
+    if candidate is not None:
+        sel = sel.where(feedback_table.c.candidate == candidate)
+    with _engine.connect() as conn:
+        rows = [
+            {'id': r[0], 'timestamp': r[1], 'candidate': r[2], 'jd': r[3] if r[3] is not None else r[4],
+             'rating': r[5], 'comments': r[6]}
+            for r in conn.execute(sel)
+        ]
+    next_before_id = rows[-1]['id'] if len(rows) == limit else None
+    return rows, next_before_id
 
+
+def list_feedback(limit=50):
+    rows, _ = list_feedback_page(limit=limit)
+    return [(r['timestamp'], r['candidate'], r['jd'], r['rating'], r['comments']) for r in rows]
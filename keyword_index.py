@@ -0,0 +1,119 @@
+import heapq
+import json
+import math
+import os
+import tempfile
+
+import matcher
+from tokenizer import prepare
+
+
+class KeywordIndex:
+    """Inverted keyword index over a resume corpus with BM25 ranking.
+
+    Documents are tokenized with `tokenizer.tokenize`, the same tokenizer behind `extract_keywords`,
+    so JD keywords and resume terms line up. Postings map term -> {doc_id: term frequency};
+    document frequencies are the postings sizes. Documents can be added, replaced and removed
+    incrementally, and the index round-trips through a JSON file with `save`/`load`.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.docs = {}  # doc_id -> {'len': int, 'tf': {term: count}, 'meta': dict}
+        self.total_len = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.docs
+
+    def doc_freq(self, term):
+        return len(self.postings.get(term, ()))
+
+    def add(self, doc_id, resume_input, meta=None):
+        """Index a resume (text, PreparedDocument or `extract_text_from_file` dict); replaces any existing doc_id."""
+        if doc_id in self.docs:
+            self.remove(doc_id)
+        text, _ = matcher._split_resume(resume_input)
+        tf = dict(prepare(text).counts)
+        self._insert(doc_id, sum(tf.values()), tf, meta or {})
+
+    def _insert(self, doc_id, length, tf, meta):
+        self.docs[doc_id] = {'len': length, 'tf': tf, 'meta': meta}
+        self.total_len += length
+        for term, count in tf.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+
+    def remove(self, doc_id):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return False
+        self.total_len -= doc['len']
+        for term in doc['tf']:
+            plist = self.postings.get(term)
+            if plist is not None:
+                plist.pop(doc_id, None)
+                if not plist:
+                    del self.postings[term]
+        return True
+
+    def idf(self, term):
+        n = len(self.docs)
+        df = self.doc_freq(term)
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, jd_text, k=10, query_terms=None):
+        """Return the top-k documents for a JD as [{'id', 'score', 'meta'}], best first.
+
+        The query is the JD's `extract_keywords(top_k=40)` terms, matching `match_with_weights`,
+        unless `query_terms` is given. Only postings of query terms are visited.
+        """
+        if not self.docs or k <= 0:
+            return []
+        if query_terms is None:
+            query_terms = matcher.extract_keywords(jd_text, top_k=40)
+        avg_len = self.total_len / len(self.docs) or 1.0
+        k1, b = self.k1, self.b
+
+        scores = {}
+        for term in set(query_terms):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in plist.items():
+                norm = k1 * (1.0 - b + b * self.docs[doc_id]['len'] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+
+        top = heapq.nlargest(k, scores.items(), key=lambda x: x[1])
+        return [{'id': doc_id, 'score': score, 'meta': self.docs[doc_id]['meta']} for doc_id, score in top]
+
+    def save(self, path):
+        """Write the index to `path` atomically. Postings are rebuilt from term counts on load."""
+        state = {
+            'version': self.FORMAT_VERSION,
+            'k1': self.k1,
+            'b': self.b,
+            'docs': [[doc_id, d['len'], d['tf'], d['meta']] for doc_id, d in self.docs.items()],
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f"unsupported keyword index version: {state.get('version')}")
+        index = cls(k1=state.get('k1', 1.5), b=state.get('b', 0.75))
+        for doc_id, length, tf, meta in state.get('docs', []):
+            index._insert(doc_id, length, tf, meta)
+        return index
@@ -1,34 +1,106 @@
+import hashlib
 import importlib
+import itertools
+import logging
 import os
-import re
+import threading
+from collections import OrderedDict
 import numpy as np
+import metrics
+from tokenizer import PreparedDocument, extract_keywords, prepare
+
+
+logger = logging.getLogger(__name__)
+
+# Embedding backend, chosen per deployment (see `register_encoder`). Setting RESUME_ENCODER enables
+# embeddings; RESUME_ENABLE_EMBEDDINGS=1 alone keeps the original sentence-transformers model.
+ENCODER = os.environ.get('RESUME_ENCODER', '').strip().lower() or 'sentence-transformers'
 
 # Control whether to enable embeddings via environment variable to avoid heavy imports by default
-_ENABLE_EMBEDDINGS = os.environ.get('RESUME_ENABLE_EMBEDDINGS', '0') in ('1', 'true', 'True')
+_ENABLE_EMBEDDINGS = (os.environ.get('RESUME_ENABLE_EMBEDDINGS', '0') in ('1', 'true', 'True')
+                      or bool(os.environ.get('RESUME_ENCODER', '').strip()))
 
 # Lazy-load model to keep startup quick during development
 _model = None
+_model_lock = threading.Lock()
 _HAS_ST = False
 
+# name -> zero-argument factory returning an object with encode(texts, batch_size=32) -> (n, dim) array
+_ENCODERS = {}
+
+
+def register_encoder(name):
+    """Decorator registering an encoder factory under `name` (selected with RESUME_ENCODER)."""
+    def decorator(factory):
+        _ENCODERS[name] = factory
+        return factory
+    return decorator
+
+
+def available_encoders():
+    return sorted(_ENCODERS)
+
+
+@register_encoder('sentence-transformers')
+def _sentence_transformer_encoder():
+    global _HAS_ST
+    try:
+        st_mod = importlib.import_module('sentence_transformers')
+        SentenceTransformer = getattr(st_mod, 'SentenceTransformer')
+        model = SentenceTransformer(os.environ.get('RESUME_ST_MODEL', 'all-MiniLM-L6-v2'))
+        _HAS_ST = True
+        return model
+    except Exception:
+        _HAS_ST = False
+        raise
+
+
+def _hashing_encoder(svd_components=None):
+    from encoders import HashingEncoder
+    state = os.environ.get('RESUME_ENCODER_STATE')
+    if state:
+        # fitted IDF/SVD state shared by every worker of the deployment
+        return HashingEncoder.load(state)
+    return HashingEncoder(n_features=int(os.environ.get('RESUME_HASHING_FEATURES', 2 ** 12)),
+                          svd_components=svd_components)
+
+
+@register_encoder('hashing')
+def _hashing():
+    return _hashing_encoder()
+
+
+@register_encoder('tfidf')
+def _tfidf():
+    if not os.environ.get('RESUME_ENCODER_STATE'):
+        logger.warning('RESUME_ENCODER=tfidf without RESUME_ENCODER_STATE; using unfitted hashing vectors '
+                       '(fit one with `python encoders.py fit`)')
+    return _hashing_encoder(svd_components=int(os.environ.get('RESUME_SVD_COMPONENTS', 256)))
+
+
+def create_encoder(name=None):
+    """Build a new encoder instance for `name` (default: the configured ENCODER)."""
+    name = name or ENCODER
+    if name not in _ENCODERS:
+        raise ValueError(f"unknown encoder {name!r}; choose from {', '.join(available_encoders())}")
+    return _ENCODERS[name]()
+
 
 def _get_model():
-    """Lazily import sentence-transformers and return a model instance.
+    """Lazily create and return the configured encoder (sentence-transformers by default).
 
-    Raises RuntimeError if embeddings are not enabled or import fails.
+    Raises RuntimeError if embeddings are not enabled, or the backend's error if it fails to load.
     """
-    global _model, _HAS_ST
+    global _model
     if not _ENABLE_EMBEDDINGS:
         raise RuntimeError('Embeddings disabled via RESUME_ENABLE_EMBEDDINGS')
 
     if _model is None:
-        try:
-            st_mod = importlib.import_module('sentence_transformers')
-            SentenceTransformer = getattr(st_mod, 'SentenceTransformer')
-            _model = SentenceTransformer('all-MiniLM-L6-v2')
-            _HAS_ST = True
-        except Exception as e:
-            _HAS_ST = False
-            raise
+        # the warm-up thread and a first request may race to load the model
+        with _model_lock:
+            if _model is None:
+                with metrics.timed('model_load'):
+                    _model = create_encoder()
     return _model
 
 
@@ -44,40 +116,84 @@ def _cosine_sim(a, b):
     return float(np.dot(a, b) / denom)
 
 
-def extract_keywords(text, top_k=20):
-    # very simple keyword extraction: return frequent words excluding stopwords
-    words = re.findall(r"\b[a-zA-Z][a-zA-Z0-9+#.+-]{1,}\b", (text or '').lower())
-    stop = set(["the", "and", "for", "with", "a", "an", "to", "in", "on", "of", "is", "are", "as", "by", "from"])
-    freq = {}
-    for w in words:
-        if w in stop or len(w) < 3:
-            continue
-        freq[w] = freq.get(w, 0) + 1
-    items = sorted(freq.items(), key=lambda x: x[1], reverse=True)
-    return [w for w, _ in items[:top_k]]
+def _split_resume(resume_input):
+    """Return (text, meta) for a plain string, PreparedDocument or `extract_text_from_file` dict."""
+    if isinstance(resume_input, dict):
+        return resume_input.get('text', ''), resume_input.get('meta', {})
+    return resume_input or '', {}
+
+
+def _text(doc):
+    return doc.text if isinstance(doc, PreparedDocument) else (doc or '')
+
+
+def _resume_keywords(resume_text, resume_meta):
+    """Resume terms used for keyword overlap: meta.skills (if present) or extracted keywords."""
+    if resume_meta and isinstance(resume_meta.get('skills'), (list, tuple)) and len(resume_meta.get('skills')) > 0:
+        return [s.lower() for s in resume_meta.get('skills')]
+    return extract_keywords(resume_text, top_k=120)
+
+
+def _keyword_score(jd_keywords, resume_text, resume_meta):
+    """Keyword-overlap score using either meta.skills (if present) or extracted keywords."""
+    res_keywords = _resume_keywords(resume_text, resume_meta)
+
+    overlap = len(set(jd_keywords) & set(res_keywords))
+    kw_score = overlap / max(1, len(jd_keywords))
+    return kw_score, res_keywords
+
+
+def combine_scores(skill_sims, exp_sims, weight_embedding=0.7, weight_keywords=0.3):
+    """Recombine stored component scores (details['skill_sim'], details['exp_sim']) under new weights.
+
+    Vectorized over any number of candidates; gives the same final scores as `match_with_weights`.
+    """
+    skill_sims = np.asarray(skill_sims, dtype=np.float64)
+    exp_sims = np.asarray(exp_sims, dtype=np.float64)
+    return np.clip(weight_embedding * exp_sims + weight_keywords * skill_sims, 0.0, 1.0)
+
+
+def _combine(jd_keywords, emb_sim, kw_score, res_keywords, resume_meta, emb_fallback,
+             weight_embedding, weight_keywords, timings=None, resume_input=None):
+    final = weight_embedding * emb_sim + weight_keywords * kw_score
+    final = max(0.0, min(1.0, final))
+
+    details = {
+        'skill_sim': kw_score,
+        'exp_sim': emb_sim,
+        'top_keywords': [k for k in res_keywords if k in jd_keywords],
+        'emb_fallback': emb_fallback,
+        'meta': resume_meta,
+        'timings': timings or {},
+    }
+    # carry extraction stats through so one dict shows where the time went for this candidate
+    if isinstance(resume_input, dict) and resume_input.get('stats'):
+        details['parse_stats'] = resume_input['stats']
+    return final, details
 
 
 def match_with_weights(jd_text, resume_input, weight_embedding=0.7, weight_keywords=0.3):
     """Compute a weighted match score between a job description and a resume.
 
     resume_input can be either a plain text string or the dict {'text':..., 'meta':...} returned by `extract_text_from_file`.
+    Either text (and jd_text) may also be a `tokenizer.PreparedDocument` to reuse its tokenization.
 
     Returns: (final_score, details_dict)
     """
-    if isinstance(resume_input, dict):
-        resume_text = resume_input.get('text', '')
-        resume_meta = resume_input.get('meta', {})
-    else:
-        resume_text = resume_input or ''
-        resume_meta = {}
+    timings = {}
+    resume_text, resume_meta = _split_resume(resume_input)
+    with metrics.timed('tokenize', timings):
+        resume_doc = prepare(resume_text)
+        jd_doc = prepare(jd_text)
 
     emb_sim = 0.0
     emb_fallback = False
     if _ENABLE_EMBEDDINGS:
         try:
             model = _get_model()
-            jd_emb = model.encode([jd_text])[0]
-            res_emb = model.encode([resume_text])[0]
+            with metrics.timed('encode', timings):
+                jd_emb = model.encode([jd_doc.text])[0]
+                res_emb = model.encode([resume_doc.text])[0]
             emb_sim = _cosine_sim(jd_emb, res_emb)
         except Exception:
             emb_fallback = True
@@ -85,28 +201,225 @@ def match_with_weights(jd_text, resume_input, weight_embedding=0.7, weight_keywo
     else:
         emb_fallback = True
         emb_sim = 0.0
+    if emb_fallback:
+        metrics.count('embedding_fallbacks')
 
-    # Keyword-based score using either meta.skills (if present) or extracted keywords
-    jd_keywords = extract_keywords(jd_text, top_k=40)
-    if resume_meta and isinstance(resume_meta.get('skills'), (list, tuple)) and len(resume_meta.get('skills')) > 0:
-        res_keywords = [s.lower() for s in resume_meta.get('skills')]
+    with metrics.timed('keywords', timings):
+        jd_keywords = jd_doc.top_keywords(40)
+        kw_score, res_keywords = _keyword_score(jd_keywords, resume_doc, resume_meta)
+    return _combine(jd_keywords, emb_sim, kw_score, res_keywords, resume_meta, emb_fallback,
+                    weight_embedding, weight_keywords, timings, resume_input)
+
+
+def _batch_cosine(jd_emb, res_embs):
+    """Cosine similarity of one vector against every row of a matrix, as one operation."""
+    jd_emb = np.asarray(jd_emb, dtype=np.float32).ravel()
+    res_embs = np.asarray(res_embs, dtype=np.float32)
+    if jd_emb.size == 0 or res_embs.size == 0:
+        return np.zeros(len(res_embs), dtype=np.float32)
+    norms = np.linalg.norm(res_embs, axis=1) * np.linalg.norm(jd_emb)
+    dots = res_embs @ jd_emb
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
+
+
+def match_batch(jd_text, resumes, weight_embedding=0.7, weight_keywords=0.3, batch_size=32):
+    """Score many resumes against one job description.
+
+    Equivalent to calling `match_with_weights` for each resume, but the JD is embedded and
+    tokenized once and resumes are encoded `batch_size` at a time.
+
+    Returns a list of (final_score, details_dict) in the same order as `resumes`.
+    Stages shared by the whole batch appear in each details['timings'] with a `batch_` prefix.
+    """
+    parts = [_split_resume(r) for r in resumes]
+    if not parts:
+        return []
+    batch_timings = {}
+    jd_doc = prepare(jd_text)
+
+    emb_sims = np.zeros(len(parts), dtype=np.float32)
+    emb_fallback = False
+    if _ENABLE_EMBEDDINGS:
+        try:
+            model = _get_model()
+            with metrics.timed('encode', batch_timings):
+                jd_emb = model.encode([jd_doc.text])[0]
+                texts = [_text(text) for text, _ in parts]
+                res_embs = model.encode(texts, batch_size=max(1, int(batch_size)))
+            emb_sims = _batch_cosine(jd_emb, res_embs)
+        except Exception:
+            emb_fallback = True
+            emb_sims = np.zeros(len(parts), dtype=np.float32)
     else:
-        res_keywords = extract_keywords(resume_text, top_k=120)
+        emb_fallback = True
+    if emb_fallback:
+        metrics.count('embedding_fallbacks', len(parts))
+    batch_timings = {'batch_' + k: v for k, v in batch_timings.items()}
 
-    overlap = len(set(jd_keywords) & set(res_keywords))
-    kw_score = overlap / max(1, len(jd_keywords))
+    jd_keywords = jd_doc.top_keywords(40)
+    results = []
+    for resume_input, (resume_text, resume_meta), emb_sim in zip(resumes, parts, emb_sims):
+        timings = dict(batch_timings)
+        with metrics.timed('keywords', timings):
+            kw_score, res_keywords = _keyword_score(jd_keywords, resume_text, resume_meta)
+        results.append(_combine(jd_keywords, float(emb_sim), kw_score, res_keywords, resume_meta,
+                                emb_fallback, weight_embedding, weight_keywords, timings, resume_input))
+    return results
 
-    final = weight_embedding * emb_sim + weight_keywords * kw_score
-    final = max(0.0, min(1.0, final))
 
-    details = {
-        'skill_sim': kw_score,
-        'exp_sim': emb_sim,
-        'top_keywords': [k for k in res_keywords if k in jd_keywords],
+def _term_matrix(term_lists, vocab):
+    """Binary sparse (len(term_lists), len(vocab)) matrix; terms outside `vocab` are dropped."""
+    from scipy import sparse
+
+    rows, cols = [], []
+    for i, terms in enumerate(term_lists):
+        for j in {vocab[t] for t in terms if t in vocab}:
+            rows.append(i)
+            cols.append(j)
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(term_lists), len(vocab)))
+
+
+def _top_k(scores, k):
+    """Column indices of the k best scores in each row, best first (ties keep the lower index)."""
+    return np.argsort(-scores, axis=1, kind='stable')[:, :k]
+
+
+def match_matrix(jd_texts, resumes, weight_embedding=0.7, weight_keywords=0.3, top_k=5,
+                 chunk_size=256, batch_size=32, return_scores=False):
+    """Score every resume against every job description.
+
+    Gives the same scores as calling `match_with_weights` for each (JD, resume) pair, but JDs are
+    embedded and tokenized once, each chunk of `chunk_size` resumes is embedded in batches and
+    scored against all JDs with one matrix product, and keyword overlap for the chunk is one
+    sparse product of binary JD and resume term matrices. Only an (M, chunk_size) block of scores
+    is held at a time, so `resumes` may be a generator over a large corpus.
+
+    Returns a dict:
+    - 'by_resume': for each resume, the top_k [(jd_index, score), ...], best first;
+    - 'by_jd': for each JD, the top_k [(resume_index, score), ...], best first;
+    - 'emb_fallback': True if embeddings were disabled or failed (scores are keyword-only);
+    - 'scores': the full (M, N) float32 matrix, only when return_scores=True.
+
+    If encoding fails after earlier chunks were already scored with embeddings, RuntimeError is
+    raised (from the encoder's error) rather than returning a mix of embedding and keyword-only
+    scores; `resumes` may be a generator, so those chunks cannot be re-scored.
+    """
+    jd_docs = [prepare(jd) for jd in jd_texts]
+    n_jds = len(jd_docs)
+    k = max(0, int(top_k))
+    jd_keywords = [doc.top_keywords(40) for doc in jd_docs]
+    vocab = {}
+    for terms in jd_keywords:
+        for t in terms:
+            vocab.setdefault(t, len(vocab))
+    jd_terms = _term_matrix(jd_keywords, vocab)
+    jd_sizes = np.array([max(1, len(terms)) for terms in jd_keywords], dtype=np.float64)[:, None]
+
+    model = None
+    jd_embs = None
+    emb_fallback = not _ENABLE_EMBEDDINGS
+    if not emb_fallback and n_jds:
+        try:
+            model = _get_model()
+            with metrics.timed('encode'):
+                jd_embs = _normalize_rows(model.encode([doc.text for doc in jd_docs], batch_size=max(1, int(batch_size))))
+        except Exception:
+            emb_fallback = True
+
+    by_resume = []
+    best_idx = np.zeros((n_jds, 0), dtype=np.int64)
+    best_scores = np.zeros((n_jds, 0), dtype=np.float64)
+    blocks = []
+    start = 0
+    resumes = iter(resumes)
+    while True:
+        chunk = list(itertools.islice(resumes, max(1, int(chunk_size))))
+        if not chunk:
+            break
+        parts = [_split_resume(r) for r in chunk]
+
+        emb_sims = np.zeros((n_jds, len(chunk)), dtype=np.float64)
+        if not emb_fallback and n_jds:
+            try:
+                with metrics.timed('encode'):
+                    res_embs = _normalize_rows(model.encode([_text(t) for t, _ in parts], batch_size=max(1, int(batch_size))))
+                emb_sims = (jd_embs @ res_embs.T).astype(np.float64)
+            except Exception as e:
+                if start:
+                    raise RuntimeError(f'embedding failed after {start} resumes were scored with embeddings') from e
+                emb_fallback = True
+        if emb_fallback:
+            metrics.count('embedding_fallbacks', len(chunk))
+
+        with metrics.timed('keywords'):
+            res_terms = _term_matrix([_resume_keywords(t, m) for t, m in parts], vocab)
+            overlap = (jd_terms @ res_terms.T).toarray()
+        scores = np.clip(weight_embedding * emb_sims + weight_keywords * (overlap / jd_sizes), 0.0, 1.0)
+
+        if return_scores:
+            blocks.append(scores.astype(np.float32))
+        if k and n_jds:
+            for row, cols in zip(scores.T, _top_k(scores.T, k)):
+                by_resume.append([(int(j), float(row[j])) for j in cols])
+            # merge this chunk into the running per-JD top-k; earlier resumes come first on ties
+            cand_idx = np.concatenate([best_idx, np.arange(start, start + len(chunk))[None, :].repeat(n_jds, 0)], axis=1)
+            cand_scores = np.concatenate([best_scores, scores], axis=1)
+            keep = _top_k(cand_scores, k)
+            best_idx = np.take_along_axis(cand_idx, keep, axis=1)
+            best_scores = np.take_along_axis(cand_scores, keep, axis=1)
+        else:
+            by_resume.extend([] for _ in chunk)
+        start += len(chunk)
+
+    result = {
+        'by_resume': by_resume,
+        'by_jd': [[(int(i), float(sc)) for i, sc in zip(idx, row)] for idx, row in zip(best_idx, best_scores)],
         'emb_fallback': emb_fallback,
-        'meta': resume_meta
     }
-    return final, details
+    if return_scores:
+        result['scores'] = np.concatenate(blocks, axis=1) if blocks else np.zeros((n_jds, 0), dtype=np.float32)
+    return result
+
+
+# Sentence embeddings cached per text (JD or resume) so explaining N candidates encodes the JD once
+_SENT_CACHE_SIZE = int(os.environ.get('RESUME_SENT_CACHE_SIZE', 512))
+_sent_cache = OrderedDict()
+_sent_cache_lock = threading.Lock()
+
+
+def _normalize_rows(mat):
+    mat = np.asarray(mat, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat[None, :]
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return np.divide(mat, norms, out=np.zeros_like(mat), where=norms != 0)
+
+
+def _sentence_embeddings(model, sents):
+    """Return L2-normalised embeddings for `sents`, cached by content hash (LRU)."""
+    digest = hashlib.sha256('\0'.join(sents).encode('utf-8')).hexdigest()
+    key = (id(model), digest)
+    with _sent_cache_lock:
+        cached = _sent_cache.get(key)
+        if cached is not None:
+            _sent_cache.move_to_end(key)
+    if cached is not None:
+        metrics.count('sentence_cache_hits')
+        return cached
+    metrics.count('sentence_cache_misses')
+    with metrics.timed('encode_sentences'):
+        embs = _normalize_rows(model.encode(sents))
+    with _sent_cache_lock:
+        _sent_cache[key] = embs
+        while len(_sent_cache) > _SENT_CACHE_SIZE:
+            _sent_cache.popitem(last=False)
+    return embs
+
+
+def clear_sentence_cache():
+    with _sent_cache_lock:
+        _sent_cache.clear()
 
 
 def explain_match(jd_text, resume_input, top_k=3):
@@ -114,14 +427,13 @@ def explain_match(jd_text, resume_input, top_k=3):
 
     Returns a list of dicts: { 'resume_sentence', 'best_jd_sentence', 'score' }
     """
-    if isinstance(resume_input, dict):
-        resume_text = resume_input.get('text', '')
-    else:
-        resume_text = resume_input or ''
+    resume_text, _ = _split_resume(resume_input)
+    jd_doc = prepare(jd_text)
+    resume_doc = prepare(resume_text)
 
     # Simple sentence split
-    jd_sents = [s.strip() for s in re.split(r'(?<=[\.!?])\s+', jd_text) if s.strip()]
-    res_sents = [s.strip() for s in re.split(r'(?<=[\.!?])\s+', resume_text) if s.strip()]
+    jd_sents = jd_doc.sentences()
+    res_sents = resume_doc.sentences()
 
     results = []
 
@@ -130,23 +442,23 @@ def explain_match(jd_text, resume_input, top_k=3):
         try:
             model = _get_model()
             if jd_sents and res_sents:
-                jd_embs = model.encode(jd_sents)
-                res_embs = model.encode(res_sents)
-                for r_idx, r_emb in enumerate(res_embs):
-                    sims = [ _cosine_sim(r_emb, j_emb) for j_emb in jd_embs ]
-                    best_i = int(np.argmax(sims))
-                    results.append({'resume_sentence': res_sents[r_idx], 'best_jd_sentence': jd_sents[best_i], 'score': float(sims[best_i])})
-            # sort by score and return top_k
-            results = sorted(results, key=lambda x: x['score'], reverse=True)[:top_k]
+                jd_embs = _sentence_embeddings(model, jd_sents)
+                res_embs = _sentence_embeddings(model, res_sents)
+                # one (resume x JD) cosine matrix; best JD sentence per resume sentence
+                sims = res_embs @ jd_embs.T
+                best = np.argmax(sims, axis=1)
+                best_scores = sims[np.arange(len(res_sents)), best]
+                order = np.argsort(-best_scores, kind='stable')[:top_k]
+                results = [{'resume_sentence': res_sents[i], 'best_jd_sentence': jd_sents[int(best[i])], 'score': float(best_scores[i])} for i in order]
             return results
         except Exception:
             # fall back to keyword overlap
             pass
 
     # Keyword-overlap fallback: score each resume sentence by overlap with JD keywords
-    jd_keywords = set(extract_keywords(jd_text, top_k=60))
-    for s in res_sents:
-        words = set(re.findall(r"\b[a-zA-Z][a-zA-Z0-9+#.+-]{1,}\b", s.lower()))
+    jd_keywords = set(jd_doc.top_keywords(60))
+    for i, s in enumerate(res_sents):
+        words = resume_doc.sentence_words(i)
         overlap = len(words & jd_keywords)
         score = overlap / max(1, len(jd_keywords))
         results.append({'resume_sentence': s, 'best_jd_sentence': '', 'score': float(score)})
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Recent samples kept per stage for percentiles; count/sum cover the whole process lifetime
+_WINDOW = 2048
+
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+    return sorted_samples[idx]
+
+
+class Registry:
+    """Process-wide stage timers and event counters for the screening pipeline."""
+
+    def __init__(self, window=_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._timers = {}  # stage -> {'samples': deque, 'count': int, 'sum': float}
+        self._counters = {}
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            t = self._timers.get(stage)
+            if t is None:
+                t = self._timers[stage] = {'samples': deque(maxlen=self._window), 'count': 0, 'sum': 0.0}
+            t['samples'].append(seconds)
+            t['count'] += 1
+            t['sum'] += seconds
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def record(self, timings=None, counters=None):
+        """Merge per-item timings/counters, e.g. those returned from a worker process."""
+        for stage, seconds in (timings or {}).items():
+            self.observe(stage, seconds)
+        for name, value in (counters or {}).items():
+            self.inc(name, value)
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """Return {'stages': {stage: {'count', 'sum', 'p50', 'p95'}}, 'counters': {...}, 'rates': {...}}."""
+        with self._lock:
+            timers = {k: (sorted(v['samples']), v['count'], v['sum']) for k, v in self._timers.items()}
+            counters = dict(self._counters)
+        stages = {}
+        for stage, (samples, count, total) in sorted(timers.items()):
+            stages[stage] = {'count': count, 'sum': total, 'p50': _percentile(samples, 0.5), 'p95': _percentile(samples, 0.95)}
+        rates = {}
+        for prefix in ('parse_cache', 'sentence_cache'):
+            hits = counters.get(prefix + '_hits', 0)
+            lookups = hits + counters.get(prefix + '_misses', 0)
+            if lookups:
+                rates[prefix + '_hit_rate'] = hits / lookups
+        return {'stages': stages, 'counters': counters, 'rates': rates}
+
+    def to_prometheus(self, prefix='resume'):
+        """Render the registry in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = [
+            f'# HELP {prefix}_stage_seconds Time spent per pipeline stage.',
+            f'# TYPE {prefix}_stage_seconds summary',
+        ]
+        for stage, s in snap['stages'].items():
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="0.5"}} {s["p50"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="0.95"}} {s["p95"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {s["sum"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        for name, value in sorted(snap['rates'].items()):
+            lines.append(f'# TYPE {prefix}_{name} gauge')
+            lines.append(f'{prefix}_{name} {value:.6f}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+@contextmanager
+def timed(stage, timings=None):
+    """Time a block: record it in REGISTRY and, if given, add it to the `timings` dict."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        REGISTRY.observe(stage, elapsed)
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def count(name, value=1, counters=None):
+    """Increment a counter in REGISTRY and, if given, in the `counters` dict."""
+    REGISTRY.inc(name, value)
+    if counters is not None:
+        counters[name] = counters.get(name, 0) + value
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# Default on-disk cap for cached parse results (bytes)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Seconds between re-reading the directory size, to see entries written by other processes
+RESCAN_INTERVAL = 1.0
+
+
+class ParseCache:
+    """Content-addressed on-disk cache for `extract_text_from_file` results.
+
+    Entries are keyed by the SHA-256 of the file bytes plus the parser config, stored as one
+    JSON file each, and evicted least-recently-used first once the directory exceeds `max_bytes`.
+    Recency is tracked through file mtimes so several processes can share one directory.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+        self._scanned = time.monotonic()
+
+    @staticmethod
+    def make_key(data, config=None):
+        """Return the cache key for raw file bytes (or a seekable binary file) and a parser config."""
+        if hasattr(data, 'read'):
+            h = hashlib.sha256()
+            data.seek(0)
+            for chunk in iter(lambda: data.read(1024 * 1024), b''):
+                h.update(chunk)
+            data.seek(0)
+        else:
+            h = hashlib.sha256(data)
+        h.update(b'\0')
+        h.update(json.dumps(config or {}, sort_keys=True).encode('utf-8'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _entries(self):
+        out = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return out
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            out.append((st.st_mtime, path, st.st_size))
+        return out
+
+    def get(self, key):
+        """Return the cached {'text', 'meta'} dict for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store `value` under `key` and evict old entries if the size cap is exceeded."""
+        try:
+            payload = json.dumps(value, default=str).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            logger.debug("Parse result not cacheable: %s", e)
+            return
+        if len(payload) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug("Parse cache write failed: %s", e)
+            return
+        with self._lock:
+            self._size += len(payload) - replaced
+            over = self._size > self.max_bytes
+            rescan = not over and time.monotonic() - self._scanned >= RESCAN_INTERVAL
+        if rescan:
+            # other processes sharing the directory add entries this process has not counted
+            total = sum(size for _, _, size in self._entries())
+            with self._lock:
+                self._size = total
+                self._scanned = time.monotonic()
+            over = total > self.max_bytes
+        if over:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._size = total
+            self._scanned = time.monotonic()
+
+    def clear(self):
+        for _, path, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._size = 0
+
+    def stats(self):
+        """Return hit/miss counters and current on-disk usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+            }
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Return the process-wide cache configured by RESUME_PARSE_CACHE_DIR, or None if unset.
+
+    RESUME_PARSE_CACHE_MB optionally overrides the size cap.
+    """
+    global _default_cache
+    directory = os.environ.get('RESUME_PARSE_CACHE_DIR')
+    if not directory:
+        return None
+    if _default_cache is None or _default_cache.directory != directory:
+        max_mb = os.environ.get('RESUME_PARSE_CACHE_MB')
+        max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        _default_cache = ParseCache(directory, max_bytes=max_bytes)
+    return _default_cache
@@ -1,111 +1,576 @@
+import importlib
+import importlib.util
 import io
-import tempfile
 import os
 import logging
-from pdfminer.high_level import extract_text as pdf_extract_text
-from docx import Document
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+import docx_stream
+import metrics
+import structured_parser
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from parse_cache import ParseCache, get_default_cache
+
+# Heavy parsers are imported on first use of their format so importing this module stays cheap
+# (see `warmup.py` to preload them in the background). The OCR names are filled by `_load_ocr`.
+convert_from_bytes = None
+pytesseract = None
+pdfinfo_from_bytes = None
+_ocr_loaded = False
+
+
+def _pdf_extract_text(fp):
+    return importlib.import_module('pdfminer.high_level').extract_text(fp)
+
+
+def _docx_document(fp):
+    return importlib.import_module('docx').Document(fp)
 
-try:
-    from pyresparser import ResumeParser
-except Exception:
-    ResumeParser = None
 
-try:
-    from pdf2image import convert_from_bytes
-    import pytesseract
-except Exception:
-    convert_from_bytes = None
-    pytesseract = None
+# RESUME_DOCX_STREAM=0 goes back to python-docx (top-level body paragraphs only) for DOCX text
+DOCX_STREAM = os.environ.get('RESUME_DOCX_STREAM', '1') in ('1', 'true', 'True')
+
+
+def _docx_text(fp, timings=None, counters=None):
+    """DOCX text via the streaming extractor, falling back to python-docx if it fails."""
+    if DOCX_STREAM:
+        try:
+            with metrics.timed('docx_stream', timings):
+                return docx_stream.extract_text(fp)
+        except Exception:
+            metrics.count('docx_stream_fallbacks', counters=counters)
+            logger.debug('streaming DOCX extraction failed, using python-docx', exc_info=True)
+            fp.seek(0)
+    with metrics.timed('docx', timings):
+        doc = _docx_document(fp)
+        return '\n'.join([p.text for p in doc.paragraphs])
+
+
+def _load_ocr():
+    """Import pdf2image/pytesseract once; names already set (e.g. by tests) are kept."""
+    global convert_from_bytes, pytesseract, pdfinfo_from_bytes, _ocr_loaded
+    if _ocr_loaded:
+        return
+    _ocr_loaded = True
+    try:
+        pdf2image = importlib.import_module('pdf2image')
+        tesseract = importlib.import_module('pytesseract')
+    except Exception:
+        return
+    convert_from_bytes = convert_from_bytes or pdf2image.convert_from_bytes
+    pytesseract = pytesseract or tesseract
+    pdfinfo_from_bytes = pdfinfo_from_bytes or getattr(pdf2image, 'pdfinfo_from_bytes', None)
+
+
+def _ocr_available():
+    # checked without importing, for parse cache keys
+    return convert_from_bytes is not None or all(
+        importlib.util.find_spec(m) is not None for m in ('pdf2image', 'pytesseract'))
+
+
+def warm_up():
+    """Import every parser dependency now instead of on the first file of each format."""
+    importlib.import_module('pdfminer.high_level')
+    importlib.import_module('docx')
+    _load_ocr()
 
 
 logger = logging.getLogger(__name__)
 
+# Bump when extraction output changes so cached results from older parsers are not reused
+PARSER_VERSION = 4
+
+
+def _ocr_settings():
+    """OCR concurrency/memory budget from the environment.
+
+    RESUME_OCR_WORKERS: tesseract processes run at once (default: min(4, CPU count)).
+    RESUME_OCR_PAGES_IN_FLIGHT: rasterized pages held in memory at once (default: workers).
+    """
+    workers = int(os.environ.get('RESUME_OCR_WORKERS', 0)) or min(4, os.cpu_count() or 1)
+    in_flight = int(os.environ.get('RESUME_OCR_PAGES_IN_FLIGHT', 0)) or workers
+    return max(1, workers), max(1, in_flight)
+
+
+def _pdf_page_count(data):
+    if pdfinfo_from_bytes is None:
+        return None
+    try:
+        return int(pdfinfo_from_bytes(data).get('Pages'))
+    except Exception:
+        return None
+
+
+def _ocr_pdf_pages(data, max_pages=10, dpi=200, workers=None, pages_in_flight=None):
+    """OCR the first `max_pages` pages of a PDF, streaming pages through a bounded window.
 
-def _ocr_pdf_bytes(data, max_pages=10, dpi=200):
+    Only `pages_in_flight` pages are rasterized at a time and tesseract runs on them on a pool
+    of `workers` threads (tesseract itself is a subprocess, so threads parallelise fine).
+
+    Returns (page_texts, timings) where timings is a list of
+    { 'page', 'rasterize_s', 'ocr_s' } dicts, one per OCR'd page.
+    """
+    default_workers, default_in_flight = _ocr_settings()
+    workers = max(1, int(workers or default_workers))
+    pages_in_flight = max(1, int(pages_in_flight or default_in_flight))
+
+    page_count = _pdf_page_count(data)
+    last_page = min(max_pages, page_count) if page_count is not None else max_pages
+
+    def _ocr_one(page_no, img):
+        start = time.monotonic()
+        try:
+            return page_no, pytesseract.image_to_string(img), time.monotonic() - start
+        finally:
+            # release the bitmap as soon as it has been read
+            if hasattr(img, 'close'):
+                img.close()
+
+    texts = {}
+    timings = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        first = 1
+        while first <= last_page:
+            last = min(last_page, first + pages_in_flight - 1)
+            start = time.monotonic()
+            images = convert_from_bytes(data, dpi=dpi, first_page=first, last_page=last)
+            raster_each = (time.monotonic() - start) / max(1, len(images))
+            if not images:
+                break
+            futures = [pool.submit(_ocr_one, first + i, img) for i, img in enumerate(images)]
+            del images
+            for fut in futures:
+                page_no, text, ocr_s = fut.result()
+                texts[page_no] = text
+                timings.append({'page': page_no, 'rasterize_s': raster_each, 'ocr_s': ocr_s})
+            first = last + 1
+    return [texts[p] for p in sorted(texts)], timings
+
+
+def _ocr_pdf_bytes(data, max_pages=10, dpi=200, timings=None):
     """Perform OCR on PDF bytes and return extracted text.
 
+    Pages are rasterized and OCR'd a few at a time (see `_ocr_pdf_pages`); pass a list as
+    `timings` to collect per-page timings.
+
     If dependencies are missing or an error occurs, returns empty string.
     """
+    _load_ocr()
     if convert_from_bytes is None or pytesseract is None:
         logger.debug("OCR dependencies not available")
         return ""
     try:
-        images = convert_from_bytes(data, dpi=dpi)
-        texts = []
-        for i, img in enumerate(images):
-            if i >= max_pages:
-                break
-            texts.append(pytesseract.image_to_string(img))
+        texts, page_timings = _ocr_pdf_pages(data, max_pages=max_pages, dpi=dpi)
+        if timings is not None:
+            timings.extend(page_timings)
         return "\n".join(texts)
     except Exception as e:
         logger.debug("OCR failed: %s", e)
         return ""
 
 
-def extract_text_from_file(uploaded_file, max_size_bytes=10 * 1024 * 1024):
+# Uploads up to this size are spooled in memory; larger ones roll over to a temporary file
+SPOOL_MEMORY_BYTES = int(os.environ.get('RESUME_SPOOL_MEMORY_BYTES', 1024 * 1024))
+_READ_CHUNK = 64 * 1024
+
+_spools = threading.local()
+
+
+def _spool():
+    """Return this thread's reusable spool file, emptied for the next upload."""
+    spool = getattr(_spools, 'file', None)
+    if spool is None:
+        spool = _spools.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    spool.seek(0)
+    spool.truncate()
+    return spool
+
+
+def _declared_size(uploaded_file):
+    """Size reported by the upload (Streamlit's `.size`, or a real file's stat) without reading it."""
+    size = getattr(uploaded_file, 'size', None)
+    if isinstance(size, int):
+        return size
+    try:
+        return os.fstat(uploaded_file.fileno()).st_size
+    except Exception:
+        return None
+
+
+def _read_bounded(uploaded_file, limit, out=None):
+    """Copy at most limit + 1 bytes of `uploaded_file` into `out` (or a new bytes object).
+
+    Returns (data_or_out, size); size > limit means the input was too large and reading stopped.
+    """
+    buf = out if out is not None else io.BytesIO()
+    size = 0
+    while size <= limit:
+        try:
+            chunk = uploaded_file.read(min(_READ_CHUNK, limit + 1 - size))
+        except TypeError:
+            # minimal uploads whose read() takes no size hand over everything at once
+            chunk = uploaded_file.read()
+            buf.write(chunk[:limit + 1 - size])
+            size += min(len(chunk), limit + 1 - size)
+            break
+        if not chunk:
+            break
+        buf.write(chunk)
+        size += len(chunk)
+    if out is None:
+        return buf.getvalue(), size
+    return out, size
+
+
+def sniff_format(head, fp=None):
+    """Detect 'pdf', 'docx', 'text' or 'binary' from leading bytes (and the zip listing for docx)."""
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        if fp is not None:
+            try:
+                fp.seek(0)
+                with zipfile.ZipFile(fp) as zf:
+                    if 'word/document.xml' in zf.namelist():
+                        return 'docx'
+            except zipfile.BadZipFile:
+                pass
+            finally:
+                fp.seek(0)
+        return 'binary'
+    if head.startswith((b'\xff\xfe', b'\xfe\xff', b'\xef\xbb\xbf')):
+        return 'text'
+    if b'\x00' in head:
+        # images, legacy .doc and other binary formats
+        return 'binary'
+    return 'text'
+
+
+def _parser_config(fmt, structured=True):
+    """Settings that affect extraction output; part of the parse cache key."""
+    return {
+        'version': PARSER_VERSION,
+        'format': fmt,
+        'ocr': _ocr_available(),
+        'structured': structured_parser.config() if structured else None,
+    }
+
+
+def extract_text_from_file(uploaded_file, max_size_bytes=10 * 1024 * 1024, cache=None, structured=True):
     """Extract text and structured fields from uploaded resume file.
 
-    Returns a dict: { 'text': str, 'meta': dict }.
+    The upload is checked against `max_size_bytes` before reading when it reports a size, and
+    otherwise read in chunks that stop one byte past the limit. Accepted bytes go to a reusable
+    per-thread spool (memory up to RESUME_SPOOL_MEMORY_BYTES, then a temp file) that every
+    parser reads from, and the format is sniffed from magic bytes rather than the file name.
+
+    cache: optional `ParseCache`; defaults to the one configured by RESUME_PARSE_CACHE_DIR.
+    Pass cache=False to bypass caching.
+
+    structured: set False to skip `structured_parser` and return meta {}, for callers that parse
+    many texts afterwards with `structured_parser.parse_many`.
+
+    Returns a dict: { 'text': str, 'meta': dict, 'stats': dict }, where `stats` holds the
+    per-stage `timings` (seconds) and event `counters` for this file, plus `ocr_pages` (the
+    per-page timings from `_ocr_pdf_pages`) when the file was OCR'd. Files that are not parsed
+    (empty, too large, unsupported binary format) also carry
+    'rejected': {'reason': 'empty' | 'size' | 'format', 'message': str}.
     """
     filename = getattr(uploaded_file, 'name', 'uploaded').lower()
-    data = uploaded_file.read()
+    stats = {'timings': {}, 'counters': {}}
 
-    if not data:
-        return {'text': '', 'meta': {}}
+    def rejected(reason, message):
+        return {'text': '', 'meta': {}, 'stats': stats, 'rejected': {'reason': reason, 'message': message}}
 
-    if len(data) > max_size_bytes:
-        logger.debug("File too large: %d bytes", len(data))
-        return {'text': '', 'meta': {}}
+    declared = _declared_size(uploaded_file)
+    if declared is not None and declared > max_size_bytes:
+        logger.debug("File too large: %d bytes", declared)
+        metrics.count('files_rejected_size', counters=stats['counters'])
+        return rejected('size', f'{declared} bytes exceeds the {max_size_bytes} byte limit')
 
+    spool, size = _read_bounded(uploaded_file, max_size_bytes, out=_spool())
+    if not size:
+        return rejected('empty', 'file is empty')
+    if size > max_size_bytes:
+        logger.debug("File too large: more than %d bytes", max_size_bytes)
+        metrics.count('files_rejected_size', counters=stats['counters'])
+        return rejected('size', f'exceeds the {max_size_bytes} byte limit')
+
+    spool.seek(0)
+    fmt = sniff_format(spool.read(2048), spool)
+    spool.seek(0)
+    if fmt == 'binary':
+        logger.debug("Unsupported binary format: %s", filename)
+        metrics.count('files_rejected_format', counters=stats['counters'])
+        return rejected('format', 'unsupported binary format (expected PDF, DOCX or text)')
+    ext = os.path.splitext(filename)[1].lstrip('.')
+    if (ext in ('pdf', 'docx') or fmt != 'text') and ext != fmt:
+        metrics.count('format_mismatches', counters=stats['counters'])
+
+    metrics.count('files_parsed', counters=stats['counters'])
+    if cache is None:
+        cache = get_default_cache()
+    ocr_pages = []
+    if not cache:
+        result = _extract_file(fmt, spool, stats['timings'], stats['counters'], structured, ocr_pages)
+        if ocr_pages:
+            stats['ocr_pages'] = ocr_pages
+        result['stats'] = stats
+        return result
+
+    with metrics.timed('parse_cache_lookup', stats['timings']):
+        key = ParseCache.make_key(spool, _parser_config(fmt, structured))
+        cached = cache.get(key)
+    if cached is not None:
+        metrics.count('parse_cache_hits', counters=stats['counters'])
+        cached['stats'] = stats
+        return cached
+    metrics.count('parse_cache_misses', counters=stats['counters'])
+    result = _extract_file(fmt, spool, stats['timings'], stats['counters'], structured, ocr_pages)
+    cache.put(key, result)
+    if ocr_pages:
+        stats['ocr_pages'] = ocr_pages
+    result['stats'] = stats
+    return result
+
+
+def _extract_file(fmt, fp, timings=None, counters=None, structured=True, ocr_pages=None):
+    """Extract text and structured fields from a seekable binary file already sniffed as `fmt`.
+
+    Per-page OCR timings are appended to the `ocr_pages` list, if given.
+    """
     text = ''
     meta = {}
 
     # Handle PDF
-    if filename.endswith('.pdf'):
+    if fmt == 'pdf':
         try:
-            text = pdf_extract_text(io.BytesIO(data)) or ''
+            with metrics.timed('pdfminer', timings):
+                text = _pdf_extract_text(fp) or ''
         except Exception:
             text = ''
 
         if not text or len(text.strip()) < 60:
-            ocr = _ocr_pdf_bytes(data)
+            metrics.count('ocr_invocations', counters=counters)
+            page_timings = []
+            with metrics.timed('ocr', timings):
+                fp.seek(0)
+                ocr = _ocr_pdf_bytes(fp.read(), timings=page_timings)
+            metrics.count('ocr_pages', len(page_timings), counters=counters)
+            if ocr_pages is not None:
+                ocr_pages.extend(page_timings)
             if ocr and len(ocr.strip()) > len(text):
                 text = ocr
 
     # Handle DOCX
-    elif filename.endswith('.docx'):
+    elif fmt == 'docx':
         try:
-            doc = Document(io.BytesIO(data))
-            text = '\n'.join([p.text for p in doc.paragraphs])
+            text = _docx_text(fp, timings, counters)
         except Exception:
             text = ''
 
     else:
+        data = fp.read()
+        if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+            text = data.decode('utf-16', errors='ignore')
+        else:
+            text = data.decode('utf-8-sig', errors='ignore')
+
+    # Structured fields from the extracted text; the spaCy pipeline stays loaded in this process
+    if structured:
         try:
-            text = data.decode('utf-8', errors='ignore')
+            meta = structured_parser.parse(text, timings)
         except Exception:
-            text = ''
+            metrics.count('structured_failures', counters=counters)
+            logger.debug('structured parsing failed', exc_info=True)
+
+    return {'text': text or '', 'meta': meta or {}}
+
+
+class _BytesUpload:
+    """Minimal stand-in for an uploaded file so raw bytes can be sent to worker processes."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.size = len(data)
+        self._buf = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._buf.read(size)
+
+
+def _extract_worker(name, data, max_size_bytes, structured=True):
+    return extract_text_from_file(_BytesUpload(name, data), max_size_bytes=max_size_bytes, structured=structured)
+
+
+def _input_name(f):
+    return f[0] if isinstance(f, tuple) else getattr(f, 'name', 'uploaded')
+
 
-    # Try structured parsing if available
-    if ResumeParser is not None:
-        tmp_path = None
+class _Rejected(Exception):
+    """An input refused before it is read in full or sent to a worker."""
+
+
+def _as_name_and_bytes(f, max_size_bytes):
+    """Return (name, bytes) for a worker; raises _Rejected for inputs over `max_size_bytes`.
+
+    A declared size is checked before anything is read; otherwise the read stops one byte past
+    the limit. File objects are closed once read.
+    """
+    if isinstance(f, tuple):
+        name, data = f[0], f[1]
+        if len(data) > max_size_bytes:
+            raise _Rejected(f'{len(data)} bytes exceeds the {max_size_bytes} byte limit')
+        return name, data
+    try:
+        declared = _declared_size(f)
+        if declared is not None and declared > max_size_bytes:
+            raise _Rejected(f'{declared} bytes exceeds the {max_size_bytes} byte limit')
+        data, size = _read_bounded(f, max_size_bytes)
+    finally:
+        close = getattr(f, 'close', None)
+        if close is not None:
+            close()
+    if size > max_size_bytes:
+        raise _Rejected(f'exceeds the {max_size_bytes} byte limit')
+    return _input_name(f), data
+
+
+def _new_pool(max_workers):
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _kill_pool(pool):
+    # ProcessPoolExecutor cannot cancel a running task, so hung workers are terminated directly
+    for proc in list((getattr(pool, '_processes', None) or {}).values()):
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as tmp:
-                tmp.write(data)
-                tmp_path = tmp.name
-            parsed = ResumeParser(tmp_path).get_extracted_data()
-            if isinstance(parsed, dict):
-                meta = parsed
-                parsed_text = parsed.get('text', '') or ''
-                if parsed_text and len(parsed_text) > len(text):
-                    text = parsed_text
+            proc.terminate()
         except Exception:
-            logger.debug('pyresparser failed or not available')
-        finally:
-            try:
-                if tmp_path and os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-            except Exception:
-                pass
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
 
-    return {'text': text or '', 'meta': meta or {}}
+
+def extract_texts_parallel(files, max_workers=None, timeout=120, max_size_bytes=10 * 1024 * 1024, structured=True):
+    """Extract many resumes on a process pool, yielding outcomes in completion order.
+
+    files: iterable of uploaded-file objects (with .name/.read()) or (name, bytes) tuples.
+    max_workers: pool size; defaults to RESUME_EXTRACT_WORKERS or the CPU count.
+    timeout: per-file wall-clock limit in seconds (None to disable). A file that exceeds it is
+    reported as a timeout and its worker is replaced so the rest of the batch keeps going.
+    When a worker dies, every file that was in flight is rerun alone on a fresh pool and only
+    a file that also crashes by itself is reported as 'crashed'.
+    structured: passed to `extract_text_from_file`; False leaves meta empty.
+
+    Yields dicts: { 'index', 'name', 'ok', 'result', 'error', 'elapsed' } where `error` is
+    None or { 'type': 'rejected' | 'timeout' | 'exception' | 'crashed', 'message': str }.
+    'rejected' covers empty, oversized and unsupported files; `result` then still holds the
+    extraction stats.
+    """
+    if max_workers is None:
+        max_workers = int(os.environ.get('RESUME_EXTRACT_WORKERS', 0)) or os.cpu_count() or 1
+    max_workers = max(1, int(max_workers))
+
+    queue = iter(enumerate(files))
+    pending = {}  # future -> (index, name, data, start, solo)
+    suspects = deque()  # (index, name, data) in flight when a worker died, rerun one at a time
+    pool = _new_pool(max_workers)
+
+    def outcome(index, name, start, result=None, error=None):
+        return {
+            'index': index,
+            'name': name,
+            'ok': error is None,
+            'result': result,
+            'error': error,
+            'elapsed': time.monotonic() - start,
+        }
+
+    def submit(index, name, data, solo=False):
+        fut = pool.submit(_extract_worker, name, data, max_size_bytes, structured)
+        pending[fut] = (index, name, data, time.monotonic(), solo)
+
+    try:
+        exhausted = False
+        while True:
+            if suspects:
+                if not pending:
+                    submit(*suspects.popleft(), solo=True)
+            # keep at most max_workers tasks in flight so submit time approximates start time
+            while not suspects and not exhausted and len(pending) < max_workers:
+                try:
+                    index, f = next(queue)
+                except StopIteration:
+                    exhausted = True
+                    break
+                try:
+                    name, data = _as_name_and_bytes(f, max_size_bytes)
+                except _Rejected as e:
+                    metrics.count('files_rejected_size')
+                    yield outcome(index, _input_name(f), time.monotonic(), error={'type': 'rejected', 'message': str(e)})
+                    continue
+                except Exception as e:
+                    yield outcome(index, _input_name(f), time.monotonic(),
+                                  error={'type': 'exception', 'message': f'read failed: {e}'})
+                    continue
+                submit(index, name, data)
+            if not pending:
+                break
+
+            wait_for = None
+            if timeout is not None:
+                nearest = min(start for _, _, _, start, _ in pending.values()) + timeout
+                wait_for = max(0.0, nearest - time.monotonic())
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            broken = False
+            for fut in done:
+                index, name, data, start, solo = pending.pop(fut)
+                try:
+                    result = fut.result()
+                    # the worker's own registry dies with it; fold its stats into this process
+                    stats = result.get('stats') or {}
+                    metrics.REGISTRY.record(stats.get('timings'), stats.get('counters'))
+                    if result.get('rejected'):
+                        yield outcome(index, name, start, result=result,
+                                      error={'type': 'rejected', 'message': result['rejected']['message']})
+                    else:
+                        yield outcome(index, name, start, result=result)
+                except BrokenProcessPool as e:
+                    broken = True
+                    if solo:
+                        yield outcome(index, name, start, error={'type': 'crashed', 'message': str(e) or 'worker process died'})
+                    else:
+                        # any file in flight may have killed the pool; retry each alone to find it
+                        suspects.append((index, name, data))
+                except Exception as e:
+                    yield outcome(index, name, start, error={'type': 'exception', 'message': f'{type(e).__name__}: {e}'})
+
+            expired = []
+            if timeout is not None:
+                now = time.monotonic()
+                expired = [fut for fut, (_, _, _, start, _) in pending.items() if now - start >= timeout]
+            for fut in expired:
+                index, name, _, start, _ = pending.pop(fut)
+                logger.debug("Extraction timed out after %ss: %s", timeout, name)
+                yield outcome(index, name, start, error={'type': 'timeout', 'message': f'exceeded {timeout}s'})
+
+            if expired or broken:
+                # restart the pool and resubmit the healthy in-flight files with a fresh deadline
+                survivors = list(pending.values())
+                pending.clear()
+                _kill_pool(pool)
+                pool = _new_pool(max_workers)
+                for index, name, data, _, solo in survivors:
+                    if broken and not solo:
+                        suspects.append((index, name, data))
+                    else:
+                        submit(index, name, data, solo)
+    finally:
+        if pending:
+            _kill_pool(pool)
+        else:
+            pool.shutdown(wait=True)
@@ -0,0 +1,298 @@
+"""Resumable command-line batch screener.
+
+Example:
+    python screen_cli.py exports/ resumes.zip --jd jds/backend.txt --jd jds/data.txt \
+        --out results.jsonl --workers 8 --batch-size 256
+
+Results are appended to --out (JSONL or CSV, by extension) as each batch is scored, and the
+keys of finished files are appended to a checkpoint file (default: <out>.ckpt). Re-running the
+same command after a crash or Ctrl-C skips everything already in the checkpoint.
+
+Extraction workers return text only; structured fields for each batch are parsed together with
+`nlp.pipe` on a `StructuredParserPool` of the same size.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import zipfile
+
+import metrics
+from matcher import match_batch
+from resume_parser import extract_texts_parallel
+from structured_parser import StructuredParserPool
+from tokenizer import prepare
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+CSV_FIELDS = ['jd', 'candidate', 'score', 'skill_sim', 'exp_sim', 'top_keywords', 'error']
+
+
+def iter_inputs(paths):
+    """Yield (key, opener, size) for every resume under `paths`; opener() returns a binary file.
+
+    Directories are walked in sorted order and .zip archives are read member by member, with
+    keys of the form `archive.zip::member` so they are stable across runs.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    yield from iter_inputs([os.path.join(root, name)])
+        elif zipfile.is_zipfile(path) and not path.lower().endswith('.docx'):
+            with zipfile.ZipFile(path) as zf:
+                members = sorted((i.filename, i.file_size) for i in zf.infolist() if not i.is_dir())
+            for member, size in members:
+                if member.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield f'{path}::{member}', _zip_opener(path, member), size
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS):
+            yield path, (lambda p=path: open(p, 'rb')), os.path.getsize(path)
+
+
+def _zip_opener(path, member):
+    def open_member():
+        zf = zipfile.ZipFile(path)
+        f = zf.open(member)
+        # keep the archive open for as long as the member stream is in use
+        f._archive = zf
+        return f
+    return open_member
+
+
+class _LazyFile:
+    """Uploaded-file lookalike that opens its source only when the file is submitted for parsing.
+
+    `size` lets `extract_texts_parallel` reject oversized files without opening them; reads are
+    streamed so only the bytes the parser asks for are loaded, and `close` releases the file (and
+    its archive) after a bounded read that stopped before EOF.
+    """
+
+    def __init__(self, name, opener, size=None):
+        self.name = name
+        self.size = size
+        self._opener = opener
+        self._f = None
+
+    def read(self, size=-1):
+        if self._f is None:
+            self._f = self._opener()
+        chunk = self._f.read(size)
+        if not chunk or size is None or size < 0:
+            self.close()
+        return chunk
+
+    def close(self):
+        if self._f is not None:
+            archive = getattr(self._f, '_archive', None)
+            self._f.close()
+            if archive is not None:
+                archive.close()
+            self._f = None
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return set(line.rstrip('\n') for line in f if line.strip())
+
+
+class ResultWriter:
+    """Append rows to a JSONL or CSV file, flushing to disk after each batch."""
+
+    def __init__(self, path):
+        self.path = path
+        self.csv = path.lower().endswith('.csv')
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._f = open(path, 'a', encoding='utf-8', newline='')
+        if self.csv:
+            self._writer = csv.DictWriter(self._f, fieldnames=CSV_FIELDS)
+            if new:
+                self._writer.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.csv:
+                flat = dict(row)
+                flat['top_keywords'] = ','.join(row.get('top_keywords') or [])
+                self._writer.writerow({k: flat.get(k, '') for k in CSV_FIELDS})
+            else:
+                self._f.write(json.dumps(row, default=str) + '\n')
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        self._f.close()
+
+
+def _read_rows(path):
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                row['score'] = float(row['score'] or 0)
+                row['top_keywords'] = [k for k in (row.get('top_keywords') or '').split(',') if k]
+                yield row
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def write_ranked(out_path, ranked_path, top=None):
+    """Rewrite the incremental output sorted by JD, then score (best first), de-duplicated."""
+    seen = {}
+    for row in _read_rows(out_path):
+        seen[(row.get('jd'), row.get('candidate'))] = row
+    rows = sorted(seen.values(), key=lambda r: (str(r.get('jd')), -float(r.get('score') or 0)))
+    if top:
+        counts = {}
+        kept = []
+        for row in rows:
+            counts[row.get('jd')] = counts.get(row.get('jd'), 0) + 1
+            if counts[row.get('jd')] <= top:
+                kept.append(row)
+        rows = kept
+    if os.path.exists(ranked_path):
+        os.remove(ranked_path)
+    writer = ResultWriter(ranked_path)
+    try:
+        writer.write(rows)
+    finally:
+        writer.close()
+    return len(rows)
+
+
+def _add_structured_fields(parsed, pool):
+    """Fill each parsed resume's meta from one batched `parse_many` call."""
+    try:
+        metas = pool.parse_many([p['text'] for _, p in parsed])
+    except Exception as e:
+        metrics.count('structured_failures', len(parsed))
+        print(f'structured parsing failed for this batch: {e}', file=sys.stderr)
+        return
+    for (_, p), meta in zip(parsed, metas):
+        p['meta'] = meta
+
+
+def _score_batch(jds, parsed, args):
+    rows = []
+    for jd_name, jd_doc in jds:
+        scored = match_batch(jd_doc, [p for _, p in parsed], weight_embedding=args.weight_embedding,
+                             weight_keywords=args.weight_keywords, batch_size=args.batch_size)
+        for (key, _), (score, details) in zip(parsed, scored):
+            rows.append({
+                'jd': jd_name,
+                'candidate': key,
+                'score': score,
+                'skill_sim': details.get('skill_sim'),
+                'exp_sim': details.get('exp_sim'),
+                'top_keywords': details.get('top_keywords', [])[:10],
+                'error': '',
+            })
+    return rows
+
+
+def run(args):
+    jds = []
+    for path in args.jd:
+        with open(path, 'r', encoding='utf-8') as f:
+            jds.append((os.path.basename(path), prepare(f.read())))
+
+    checkpoint_path = args.checkpoint or args.out + '.ckpt'
+    done = load_checkpoint(checkpoint_path)
+    stats = {'processed': 0, 'failed': 0, 'skipped': 0}
+
+    def pending_inputs():
+        for key, opener, size in iter_inputs(args.inputs):
+            if key in done:
+                stats['skipped'] += 1
+                continue
+            yield _LazyFile(key, opener, size)
+
+    writer = ResultWriter(args.out)
+    structured = StructuredParserPool(workers=args.workers)
+    start = time.monotonic()
+    batch_parsed, batch_rows, batch_keys = [], [], []
+
+    def flush():
+        if batch_parsed:
+            _add_structured_fields(batch_parsed, structured)
+        rows = batch_rows + (_score_batch(jds, batch_parsed, args) if batch_parsed else [])
+        if rows:
+            writer.write(rows)
+        with open(checkpoint_path, 'a', encoding='utf-8') as ckpt:
+            ckpt.write(''.join(k + '\n' for k in batch_keys))
+            ckpt.flush()
+            os.fsync(ckpt.fileno())
+        batch_parsed.clear()
+        batch_rows.clear()
+        batch_keys.clear()
+
+    outcomes = extract_texts_parallel(pending_inputs(), max_workers=args.workers,
+                                      timeout=args.timeout, structured=False)
+    try:
+        for outcome in outcomes:
+            key = outcome['name']
+            batch_keys.append(key)
+            stats['processed'] += 1
+            if outcome['ok']:
+                batch_parsed.append((key, outcome['result']))
+            else:
+                stats['failed'] += 1
+                error = f"{outcome['error']['type']}: {outcome['error']['message']}"
+                batch_rows.extend({'jd': jd_name, 'candidate': key, 'score': 0.0, 'error': error} for jd_name, _ in jds)
+            if len(batch_keys) >= args.batch_size:
+                flush()
+                if args.progress:
+                    elapsed = time.monotonic() - start
+                    print(f"{stats['processed']} files, {stats['processed'] / max(elapsed, 1e-9):.1f} files/s", file=sys.stderr)
+        flush()
+    except KeyboardInterrupt:
+        # finished-but-unflushed files are simply redone on resume
+        print('interrupted; re-run the same command to resume', file=sys.stderr)
+        raise
+    finally:
+        outcomes.close()
+        structured.close()
+        writer.close()
+
+    elapsed = time.monotonic() - start
+    stats['elapsed_s'] = elapsed
+    stats['files_per_s'] = stats['processed'] / elapsed if elapsed > 0 else 0.0
+    if args.ranked:
+        stats['ranked_rows'] = write_ranked(args.out, args.ranked, top=args.top)
+    return stats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Screen a directory or archive of resumes against one or more JDs.')
+    parser.add_argument('inputs', nargs='+', help='resume files, directories or .zip archives')
+    parser.add_argument('--jd', action='append', required=True, help='job description text file (repeatable)')
+    parser.add_argument('--out', required=True, help='results file; .csv for CSV, anything else for JSONL')
+    parser.add_argument('--checkpoint', help='checkpoint file (default: <out>.ckpt)')
+    parser.add_argument('--ranked', help='after the run, write results sorted by JD and score to this file')
+    parser.add_argument('--top', type=int, help='keep only the top N candidates per JD in --ranked')
+    parser.add_argument('--workers', type=int, default=None, help='extraction processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=256, help='files scored and checkpointed together')
+    parser.add_argument('--timeout', type=float, default=120, help='per-file extraction timeout in seconds')
+    parser.add_argument('--weight-embedding', type=float, default=0.7)
+    parser.add_argument('--weight-keywords', type=float, default=0.3)
+    parser.add_argument('--progress', action='store_true', help='print throughput after each batch')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.batch_size = max(1, args.batch_size)
+    stats = run(args)
+    print(f"processed {stats['processed']} files ({stats['failed']} failed, {stats['skipped']} skipped from checkpoint) "
+          f"in {stats['elapsed_s']:.1f}s, {stats['files_per_s']:.1f} files/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Headless HTTP screening service.
+
+Run with: uvicorn service:app --port 8000
+
+Endpoints:
+- POST   /jobs                 multipart form: jd_text, files[], optional weight_embedding/weight_keywords
+- GET    /jobs/{job_id}        job status and progress counters
+- GET    /jobs/{job_id}/results  per-candidate results streamed as NDJSON (default) or SSE
+                                 (`?format=sse` or `Accept: text/event-stream`) as they finish
+- DELETE /jobs/{job_id}        cancel a queued or running job
+- GET    /metrics              per-stage timers and counters in Prometheus text format
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+import metrics
+from matcher import match_with_weights
+from resume_parser import extract_texts_parallel
+from tokenizer import prepare
+
+
+logger = logging.getLogger(__name__)
+
+# Jobs processed concurrently; each job parses its files on its own process pool
+MAX_CONCURRENT_JOBS = int(os.environ.get('RESUME_SERVICE_JOBS', 2))
+# Extraction processes per job, so concurrent jobs together stay within RESUME_EXTRACT_WORKERS
+# (default: the CPU count)
+JOB_WORKERS = max(1, (int(os.environ.get('RESUME_EXTRACT_WORKERS', 0)) or os.cpu_count() or 1)
+                  // max(1, MAX_CONCURRENT_JOBS))
+# Jobs waiting for a worker thread hold their uploads in memory; more are refused with 503
+MAX_QUEUED_JOBS = int(os.environ.get('RESUME_SERVICE_MAX_QUEUED', 10))
+# Finished jobs kept in memory for status/result queries before the oldest are dropped
+MAX_RETAINED_JOBS = int(os.environ.get('RESUME_SERVICE_MAX_JOBS', 100))
+MAX_FILE_BYTES = int(os.environ.get('RESUME_MAX_FILE_BYTES', 10 * 1024 * 1024))
+FILE_TIMEOUT = float(os.environ.get('RESUME_FILE_TIMEOUT', 120))
+
+_FINAL_STATES = ('done', 'cancelled', 'failed')
+
+
+class Job:
+    """State of one screening job, shared between the worker thread and request handlers."""
+
+    def __init__(self, jd_text, files, weight_embedding, weight_keywords, loop):
+        self.id = uuid.uuid4().hex
+        self.jd_text = jd_text
+        self.files = files  # [(name, bytes)], released once the job starts
+        self.weight_embedding = weight_embedding
+        self.weight_keywords = weight_keywords
+        self.total = len(files)
+        self.status = 'queued'
+        self.error = None
+        self.results = []
+        self.created = time.time()
+        self.finished = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self):
+        return self.status in _FINAL_STATES
+
+    def _notify(self):
+        # called from the worker thread; asyncio.Event is only safe to touch on its loop
+        self._loop.call_soon_threadsafe(self._changed.set)
+
+    def append(self, result):
+        with self._lock:
+            self.results.append(result)
+        self._notify()
+
+    def finish(self, status, error=None):
+        with self._lock:
+            if not self.done:
+                self.status = status
+                self.error = error
+                self.finished = time.time()
+        self._notify()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status == 'queued':
+            self.finish('cancelled')
+
+    def summary(self):
+        with self._lock:
+            processed = len(self.results)
+            failed = sum(1 for r in self.results if not r['ok'])
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'processed': processed,
+            'failed': failed,
+            'error': self.error,
+            'created': self.created,
+            'finished': self.finished,
+        }
+
+
+class _Oversized:
+    """Stand-in for an upload over MAX_FILE_BYTES; extraction reports it as a rejected file."""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def read(self, size=-1):
+        return b''
+
+
+def _run_job(job):
+    """Worker-thread body: parse files in parallel and score each one as it completes."""
+    if job._cancel.is_set():
+        job.finish('cancelled')
+        return
+    job.status = 'running'
+    files, job.files = job.files, None
+    jd_doc = prepare(job.jd_text)
+    outcomes = extract_texts_parallel(files, max_workers=JOB_WORKERS, timeout=FILE_TIMEOUT,
+                                      max_size_bytes=MAX_FILE_BYTES)
+    try:
+        for outcome in outcomes:
+            if job._cancel.is_set():
+                job.finish('cancelled')
+                return
+            result = {'index': outcome['index'], 'name': outcome['name'], 'ok': outcome['ok'],
+                      'error': outcome['error'], 'elapsed': outcome['elapsed']}
+            if outcome['ok']:
+                score, details = match_with_weights(jd_doc, outcome['result'],
+                                                    weight_embedding=job.weight_embedding,
+                                                    weight_keywords=job.weight_keywords)
+                result['score'] = score
+                result['details'] = details
+            job.append(result)
+        job.finish('done')
+    except Exception as e:
+        logger.exception('Job %s failed', job.id)
+        job.finish('failed', error=f'{type(e).__name__}: {e}')
+    finally:
+        # closing the generator shuts down (or kills) its process pool
+        outcomes.close()
+
+
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix='screening-job')
+
+
+def _register(job):
+    """Add a job to the registry; returns False if MAX_QUEUED_JOBS jobs are already waiting."""
+    with _jobs_lock:
+        if sum(1 for j in _jobs.values() if j.status == 'queued') >= MAX_QUEUED_JOBS:
+            return False
+        _jobs[job.id] = job
+        finished = [jid for jid, j in _jobs.items() if j.done]
+        for jid in finished[:max(0, len(_jobs) - MAX_RETAINED_JOBS)]:
+            del _jobs[jid]
+    return True
+
+
+def _get_job(job_id):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail='job not found')
+    return job
+
+
+app = FastAPI(title='Resume Screener', description='Batch resume screening API')
+
+
+@app.get('/health')
+def health():
+    return {'status': 'ok'}
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.REGISTRY.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+@app.post('/jobs', status_code=202)
+async def create_job(jd_text: str = Form(...), files: List[UploadFile] = File(...),
+                     weight_embedding: float = Form(0.7), weight_keywords: float = Form(0.3)):
+    if not jd_text.strip():
+        raise HTTPException(status_code=422, detail='jd_text must not be empty')
+    payload = []
+    for f in files:
+        name = f.filename or 'uploaded'
+        if f.size is not None and f.size > MAX_FILE_BYTES:
+            payload.append(_Oversized(name, f.size))
+            continue
+        # bounded read: one byte past the limit is enough to know the file is too large
+        data = await f.read(MAX_FILE_BYTES + 1)
+        # oversized files are kept as placeholders and reported per file as 'rejected'
+        payload.append(_Oversized(name, f.size or len(data)) if len(data) > MAX_FILE_BYTES else (name, data))
+    job = Job(jd_text, payload, weight_embedding, weight_keywords, asyncio.get_running_loop())
+    if not _register(job):
+        raise HTTPException(status_code=503, detail='too many queued jobs; retry later', headers={'Retry-After': '10'})
+    _executor.submit(_run_job, job)
+    return job.summary()
+
+
+@app.get('/jobs/{job_id}')
+def job_status(job_id: str):
+    return _get_job(job_id).summary()
+
+
+@app.delete('/jobs/{job_id}')
+def cancel_job(job_id: str):
+    job = _get_job(job_id)
+    job.cancel()
+    return job.summary()
+
+
+async def _iter_results(job, keepalive=15.0):
+    sent = 0
+    while True:
+        job._changed.clear()
+        with job._lock:
+            pending = job.results[sent:]
+        for result in pending:
+            yield 'result', result
+        sent += len(pending)
+        if job.done and sent >= len(job.results):
+            yield 'end', job.summary()
+            return
+        if not pending:
+            try:
+                await asyncio.wait_for(job._changed.wait(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield 'keepalive', None
+
+
+@app.get('/jobs/{job_id}/results')
+async def job_results(job_id: str, request: Request, format: str = None):
+    job = _get_job(job_id)
+    sse = format == 'sse' or (format is None and 'text/event-stream' in request.headers.get('accept', ''))
+
+    async def body():
+        async for kind, payload in _iter_results(job):
+            if sse:
+                if kind == 'keepalive':
+                    yield ': keepalive\n\n'
+                else:
+                    yield f'event: {kind}\ndata: {json.dumps(payload, default=str)}\n\n'
+            elif kind == 'result':
+                yield json.dumps(payload, default=str) + '\n'
+
+    media_type = 'text/event-stream' if sse else 'application/x-ndjson'
+    return StreamingResponse(body(), media_type=media_type)
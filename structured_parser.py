@@ -0,0 +1,269 @@
+"""Structured resume fields (skills, email, phone, name, experience, ...) from extracted text.
+
+Replaces the per-file pyresparser path: the spaCy pipeline is loaded once per process and kept
+resident, fields come from the text pdfminer/docx already produced (no temp files or
+re-extraction), and many documents can be parsed with `nlp.pipe` on a pool of long-lived
+worker processes.
+
+Configuration:
+- RESUME_SPACY_MODEL: spaCy model name (default en_core_web_sm).
+- RESUME_SKILLS_FILE: skills vocabulary, one skill per line (default data/skills.txt). Entries
+  of up to three characters and entries prefixed with '=' (English words such as Spring or
+  Excel) match case-sensitively; the rest match in any case.
+- RESUME_STRUCTURED_WORKERS / RESUME_STRUCTURED_BATCH: pool size and nlp.pipe batch size for
+  `parse_many`.
+
+Skills, email, phone, degree and experience are regex-based and are returned whether or not
+spaCy is installed. Only the NER fields (the candidate name, when not taken from the first line,
+and company names) need the spaCy model; without it `available()` is False.
+"""
+import datetime
+import hashlib
+import importlib
+import importlib.util
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = os.environ.get('RESUME_SPACY_MODEL', 'en_core_web_sm')
+BATCH_SIZE = int(os.environ.get('RESUME_STRUCTURED_BATCH', 32))
+
+# Components not needed for PERSON/ORG entities; excluding them shortens nlp.pipe
+_DISABLED_PIPES = ('lemmatizer', 'textcat')
+
+# Default skills vocabulary; see the file header for the format and case rules
+SKILLS_FILE = os.environ.get('RESUME_SKILLS_FILE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.txt')
+
+_EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+_PHONE_RE = re.compile(r'(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)[\s.-]?)?\d{3,4}[\s.-]?\d{3,4}(?:[\s.-]?\d{2,4})?')
+_YEAR_RANGE_RE = re.compile(r'\b((?:19|20)\d{2})\s*(?:-|–|to)\s*((?:19|20)\d{2}|present|current|now)\b', re.I)
+_DEGREE_RE = re.compile(r'\b(?:B\.?\s?Sc|M\.?\s?Sc|B\.?\s?Eng|M\.?\s?Eng|B\.?\s?Tech|M\.?\s?Tech|B\.?\s?A|M\.?\s?A|MBA|Ph\.?\s?D|Bachelor|Master)\b[^\n]*')
+_SECTION_RE = re.compile(r'^\s*(experience|work experience|employment|skills|education|projects|summary)\s*:?\s*$', re.I | re.M)
+
+_nlp = None
+_nlp_failed = False
+_nlp_lock = threading.Lock()
+_skills_re = None
+
+
+def _load_skills(path=None):
+    """Return [(skill, case_sensitive)] from the skills file."""
+    with open(path or SKILLS_FILE, 'r', encoding='utf-8') as f:
+        lines = [ln for ln in f.read().splitlines() if not ln.lstrip().startswith('#')]
+    skills = []
+    for entry in re.split(r'[,\n]', '\n'.join(lines)):
+        entry = entry.strip()
+        exact = entry.startswith('=')
+        entry = entry.lstrip('=').strip()
+        if entry:
+            skills.append((entry, exact or len(entry) <= 3))
+    return skills
+
+
+def _skill_pattern():
+    """One compiled alternation over the vocabulary, longest first so 'machine learning' beats 'R'.
+
+    Returns (pattern, canonical) where canonical maps a matched string (as written for
+    case-sensitive skills, lowercased for the rest) to the vocabulary spelling.
+    """
+    global _skills_re
+    if _skills_re is None:
+        skills = sorted(dict(_load_skills()).items(), key=lambda s: len(s[0]), reverse=True)
+        alt = '|'.join(re.escape(s) if exact else f'(?i:{re.escape(s)})' for s, exact in skills)
+        canonical = {s if exact else s.lower(): s for s, exact in skills}
+        _skills_re = (re.compile(rf'(?<![\w+#.&])(?:{alt})(?![\w+#&])'), canonical)
+    return _skills_re
+
+
+def _get_nlp():
+    """Load the spaCy pipeline once per process; returns None if spaCy or the model is missing."""
+    global _nlp, _nlp_failed
+    if _nlp is not None or _nlp_failed:
+        return _nlp
+    with _nlp_lock:
+        if _nlp is None and not _nlp_failed:
+            try:
+                spacy = importlib.import_module('spacy')
+                with metrics.timed('spacy_load'):
+                    _nlp = spacy.load(SPACY_MODEL, exclude=list(_DISABLED_PIPES))
+            except Exception as e:
+                _nlp_failed = True
+                logger.debug('spaCy model %s not available: %s', SPACY_MODEL, e)
+    return _nlp
+
+
+def available():
+    return _get_nlp() is not None
+
+
+def _skills_digest():
+    try:
+        with open(SKILLS_FILE, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def config():
+    """Settings that affect parse output, without loading the model (for parse cache keys)."""
+    return {
+        'spacy': importlib.util.find_spec('spacy') is not None,
+        'model': SPACY_MODEL,
+        'skills': _skills_digest(),
+    }
+
+
+def _total_experience(text):
+    """Years covered by 'YYYY-YYYY' / 'YYYY - present' ranges, overlapping ranges merged."""
+    this_year = datetime.date.today().year
+    spans = []
+    for start, end in _YEAR_RANGE_RE.findall(text):
+        end_year = this_year if not end.isdigit() else int(end)
+        if end_year >= int(start):
+            spans.append((int(start), end_year))
+    total, cur_start, cur_end = 0, None, None
+    for start, end in sorted(spans):
+        if cur_end is None or start > cur_end:
+            if cur_end is not None:
+                total += cur_end - cur_start
+            cur_start, cur_end = start, end
+        else:
+            cur_end = max(cur_end, end)
+    if cur_end is not None:
+        total += cur_end - cur_start
+    return total
+
+
+def _section_lines(text, name):
+    """Non-empty lines under a heading such as 'Experience' up to the next known heading."""
+    headings = list(_SECTION_RE.finditer(text))
+    for i, m in enumerate(headings):
+        if m.group(1).lower().endswith(name):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            return [ln.strip(' -*•\t') for ln in text[m.end():end].splitlines() if ln.strip()]
+    return []
+
+
+def extract_fields(text, doc=None):
+    """Return the pyresparser-compatible meta dict for `text`.
+
+    `doc` is the spaCy Doc for `text` when available; it contributes the candidate name and
+    company names. Keys with no value are omitted.
+    """
+    text = text or ''
+    pattern, canonical = _skill_pattern()
+    skills = []
+    seen = set()
+    for m in pattern.finditer(text):
+        skill = canonical.get(m.group(0)) or canonical.get(m.group(0).lower(), m.group(0))
+        if skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+
+    email = _EMAIL_RE.search(text)
+    phone = None
+    for m in _PHONE_RE.finditer(text):
+        digits = re.sub(r'\D', '', m.group(0))
+        # skip year ranges such as "2018-2021"
+        if 10 <= len(digits) <= 15:
+            phone = m.group(0).strip()
+            break
+
+    meta = {
+        'name': None,
+        'email': email.group(0) if email else None,
+        'mobile_number': phone,
+        'skills': skills,
+        'degree': [m.group(0).strip() for m in _DEGREE_RE.finditer(text)],
+        'experience': _section_lines(text, 'experience'),
+        'total_experience': _total_experience(text),
+        'company_names': [],
+    }
+    if doc is not None:
+        head = len(text[:300])
+        for ent in doc.ents:
+            if ent.label_ == 'PERSON' and meta['name'] is None and ent.start_char < head:
+                meta['name'] = ent.text.strip()
+            elif ent.label_ == 'ORG' and ent.text.strip() not in meta['company_names']:
+                meta['company_names'].append(ent.text.strip())
+    if meta['name'] is None:
+        first = next((ln.strip() for ln in text.splitlines() if ln.strip()), '')
+        if first and len(first.split()) <= 4 and not any(ch.isdigit() or ch == '@' for ch in first):
+            meta['name'] = first
+    return {k: v for k, v in meta.items() if v not in (None, [], '')}
+
+
+def parse(text, timings=None):
+    """Structured fields for one document; NER fields only when the spaCy pipeline is available."""
+    nlp = _get_nlp()
+    with metrics.timed('structured', timings):
+        return extract_fields(text, nlp(text) if nlp is not None else None)
+
+
+def parse_batch(texts, batch_size=BATCH_SIZE):
+    """Structured fields for many documents in this process, streamed through `nlp.pipe`."""
+    texts = [t or '' for t in texts]
+    nlp = _get_nlp()
+    with metrics.timed('structured_batch'):
+        if nlp is None:
+            return [extract_fields(t) for t in texts]
+        return [extract_fields(t, doc) for t, doc in zip(texts, nlp.pipe(texts, batch_size=batch_size))]
+
+
+def _init_worker():
+    _get_nlp()
+
+
+class StructuredParserPool:
+    """Long-lived worker processes, each holding one resident spaCy pipeline.
+
+    `parse_many` splits the texts into chunks of `batch_size`, runs `parse_batch` on them across
+    the workers and returns results in input order.
+    """
+
+    def __init__(self, workers=None, batch_size=BATCH_SIZE):
+        if workers is None:
+            workers = int(os.environ.get('RESUME_STRUCTURED_WORKERS', 0)) or os.cpu_count() or 1
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._pool
+
+    def parse_many(self, texts):
+        texts = list(texts)
+        if not texts:
+            return []
+        if self.workers == 1 or len(texts) <= self.batch_size:
+            return parse_batch(texts, self.batch_size)
+        chunks = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        out = []
+        for result in self._executor().map(parse_batch, chunks, [self.batch_size] * len(chunks)):
+            out.extend(result)
+        return out
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+_default_pool = None
+
+
+def parse_many(texts):
+    """Parse many texts on the shared `StructuredParserPool` (created on first use)."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = StructuredParserPool()
+    return _default_pool.parse_many(texts)
@@ -0,0 +1,18 @@
+import pytest
+
+
+class FakeUpload:
+    """Minimal uploaded file: a name and a read() that takes no size and returns everything."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self._b = data.encode('utf-8') if isinstance(data, str) else data
+
+    def read(self):
+        return self._b
+
+
+@pytest.fixture
+def fake_upload():
+    """The FakeUpload class; call it with (name, text or bytes)."""
+    return FakeUpload
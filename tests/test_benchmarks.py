@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Ensure project root and benchmarks/ are on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import corpus
+import run_bench
+from resume_parser import extract_text_from_file
+
+
+def test_generated_documents_round_trip_through_extraction(fake_upload):
+    for fmt in ('txt', 'docx', 'pdf'):
+        name, data, text = corpus.generate_corpus(2, fmt=fmt, words=60)[1]
+        parsed = extract_text_from_file(fake_upload(name, data), cache=False)
+        assert text.split('\n')[0] in parsed['text']
+
+
+def test_compare_flags_regressions():
+    baseline = {'results': {'explain_match@10': {'per_doc_ms': 1.0}, 'extract_txt@10': {'per_doc_ms': 1.0}}}
+    results = run_bench.run_benchmarks(['extract_keywords'], [5], repeat=1)
+    results['explain_match@10'] = {'per_doc_ms': 1.5}
+    results['extract_txt@10'] = {'per_doc_ms': 1.1}
+    regressions = run_bench.compare(results, baseline, threshold=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith('explain_match@10')
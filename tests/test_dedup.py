@@ -0,0 +1,32 @@
+import os
+import sys
+
+# Ensure project root and benchmarks/ are on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import corpus
+import dedup
+from tokenizer import prepare
+
+
+def test_near_duplicates_cluster_under_first_upload():
+    texts = {name: text for name, _, text in corpus.generate_corpus(40, words=200)[1:]}
+    names = list(texts)
+    texts['edited.docx'] = texts[names[3]].replace('Experience', 'Work Experience') + ' Also knows Rust.'
+    texts['reexport.pdf'] = prepare(texts[names[3]])
+    texts['empty.txt'] = ''
+    assignment = dedup.cluster_near_duplicates(texts)
+    groups = {rep: members for rep, members in dedup.clusters(assignment).items() if len(members) > 1}
+    assert groups == {names[3]: [names[3], 'edited.docx', 'reexport.pdf']}
+    assert assignment['empty.txt'] == 'empty.txt'
+
+
+def test_signature_similarity_tracks_jaccard():
+    hasher = dedup.MinHasher(num_perm=256)
+    a = ' '.join(f'w{i}' for i in range(200))
+    b = ' '.join(f'w{i}' for i in range(100, 300))
+    sa, sb = dedup.shingles(a), dedup.shingles(b)
+    jaccard = len(sa & sb) / len(sa | sb)
+    assert abs(dedup.similarity(hasher.signature(a), hasher.signature(b)) - jaccard) < 0.1
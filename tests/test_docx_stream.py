@@ -0,0 +1,67 @@
+import io
+import os
+import sys
+
+# Ensure project root and benchmarks/ are on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import docx
+
+import corpus
+import docx_stream
+import resume_parser
+from resume_parser import extract_text_from_file
+
+
+def _python_docx_file():
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = 'Alice Example | alice@example.com'
+    doc.add_paragraph('Experience')
+    run = doc.add_paragraph().add_run('Engineer\tat DataCo')
+    run.add_break()
+    run.add_text('2019-2022')
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = 'Skills'
+    table.cell(0, 1).text = 'Python, Kafka'
+    doc.add_paragraph('Education')
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def test_stream_keeps_python_docx_paragraphs_and_adds_headers_and_tables():
+    data = _python_docx_file()
+    paragraphs = list(docx_stream.iter_paragraphs(io.BytesIO(data)))
+    expected = [p.text for p in docx.Document(io.BytesIO(data)).paragraphs]
+    assert expected[1] == 'Engineer\tat DataCo\n2019-2022'
+    # python-docx's body paragraphs appear in order, with the header first and table cells in place
+    assert paragraphs[0] == 'Alice Example | alice@example.com'
+    assert [p for p in paragraphs if p in expected] == expected
+    assert paragraphs.index('Python, Kafka') < paragraphs.index('Education')
+
+
+def test_template_layout_text_is_recovered_once():
+    _, data, text = corpus.generate_corpus(2, fmt='docx_template', words=80)[1]
+    extracted = docx_stream.extract_text(io.BytesIO(data))
+    lines = text.split('\n')
+    skills = lines[lines.index('Skills') + 1].split(',')
+    education = lines[lines.index('Education') + 1]
+    assert extracted.count(lines[0]) == 1  # identical first-page and default headers
+    assert extracted.count(education) == 1  # DrawingML text box, not its VML fallback copy
+    assert all(skill.strip() in extracted.split('\n') for skill in skills)
+
+
+def test_extraction_falls_back_to_python_docx(monkeypatch, fake_upload):
+    def broken(fp):
+        raise ValueError('bad part')
+
+    monkeypatch.setattr(docx_stream, 'extract_text', broken)
+    parsed = extract_text_from_file(fake_upload('cv.docx', _python_docx_file()), cache=False)
+    assert parsed['stats']['counters']['docx_stream_fallbacks'] == 1
+    assert 'Engineer\tat DataCo' in parsed['text'] and 'Python, Kafka' not in parsed['text']
+
+    monkeypatch.setattr(resume_parser, 'DOCX_STREAM', False)
+    parsed = extract_text_from_file(fake_upload('cv.docx', _python_docx_file()), cache=False)
+    assert 'docx_stream_fallbacks' not in parsed['stats']['counters']
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from embedding_store import EmbeddingStore
+
+
+class FakeModel:
+    VOCAB = ['python', 'java', 'pandas', 'spring', 'docker']
+
+    def encode(self, texts, batch_size=32):
+        return np.array([[t.lower().count(w) for w in self.VOCAB] for t in texts], dtype=np.float32)
+
+
+def test_store_search_add_delete_and_reload(tmp_path):
+    store = EmbeddingStore(str(tmp_path), model=FakeModel())
+    store.add(['alice', 'bob', 'carol'],
+              ['python pandas', 'java spring', {'text': 'python docker', 'meta': {}}],
+              metas=[{'name': 'Alice'}, {}, {}])
+    top = store.search('python pandas developer', k=2)
+    assert [r['id'] for r in top] == ['alice', 'carol']
+    assert top[0]['meta'] == {'name': 'Alice'}
+
+    store.delete(['alice'])
+    assert [r['id'] for r in store.search('python pandas', k=2)] == ['carol', 'bob']
+
+    reopened = EmbeddingStore(str(tmp_path), model=FakeModel())
+    assert len(reopened) == 2
+    reopened.compact()
+    assert [r['id'] for r in reopened.search('java', k=1)] == ['bob']
+
+
+def test_quantized_store_keeps_ranking(tmp_path):
+    store = EmbeddingStore(str(tmp_path), model=FakeModel(), dtype='int8')
+    store.add(['alice', 'bob', 'carol'], ['python pandas', 'java spring', 'python docker'])
+    assert os.path.exists(os.path.join(str(tmp_path), 'vectors.i8'))
+    top = EmbeddingStore(str(tmp_path), model=FakeModel()).search('python pandas developer', k=3)
+    assert [r['id'] for r in top] == ['alice', 'carol', 'bob']
+    assert abs(top[0]['score'] - 1.0) < 0.01
+
+
+def test_rows_written_without_a_sidecar_save_are_discarded(tmp_path):
+    store = EmbeddingStore(str(tmp_path), model=FakeModel())
+    store.add(['alice'], ['python pandas'])
+    # simulate a crash after the vectors were appended but before the sidecar was saved
+    with open(store._vectors_path, 'ab') as f:
+        f.write(np.ones(5, dtype=np.float32).tobytes())
+
+    reopened = EmbeddingStore(str(tmp_path), model=FakeModel())
+    reopened.add(['bob'], ['java spring'])
+    top = reopened.search('java spring', k=1)
+    assert top[0]['id'] == 'bob' and abs(top[0]['score'] - 1.0) < 1e-4
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip('sklearn')
+
+import matcher
+from encoders import HashingEncoder
+
+
+def test_hashing_backend_scores_embeddings(monkeypatch):
+    monkeypatch.setattr(matcher, '_ENABLE_EMBEDDINGS', True)
+    monkeypatch.setattr(matcher, '_model', matcher.create_encoder('hashing'))
+    jd = 'Python developer with pandas and REST API experience'
+    good, details = matcher.match_with_weights(jd, 'Built REST APIs in Python with pandas')
+    bad, _ = matcher.match_with_weights(jd, 'Java and Spring developer')
+    assert not details['emb_fallback'] and details['exp_sim'] > 0
+    assert good > bad
+
+
+def test_fitted_svd_encoder_round_trips(tmp_path):
+    texts = ['python pandas numpy', 'java spring hibernate', 'python flask rest', 'go kubernetes docker']
+    enc = HashingEncoder(n_features=256, svd_components=2).fit(texts)
+    vecs = enc.encode(texts, batch_size=3)
+    assert vecs.shape == (4, 2)
+    np.testing.assert_allclose(np.linalg.norm(vecs, axis=1), 1.0, rtol=1e-5)
+    path = str(tmp_path / 'state.pkl')
+    enc.save(path)
+    np.testing.assert_allclose(HashingEncoder.load(path).encode(texts), vecs, rtol=1e-5)
+
+
+def test_unknown_encoder_is_rejected():
+    with pytest.raises(ValueError):
+        matcher.create_encoder('nope')
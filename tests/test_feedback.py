@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import feedback
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = str(tmp_path / 'feedback.db')
+    monkeypatch.setattr(feedback, '_engine', create_engine(f'sqlite:///{path}'))
+    monkeypatch.setattr(feedback, '_db_ready', False)
+    monkeypatch.setattr(feedback, '_known_jd_hashes', set())
+    return path
+
+
+def test_feedback_dedupes_jd_and_paginates(db):
+    for i in range(5):
+        feedback.save_feedback(f'cand{i % 2}', 'Python developer', 3 + i % 3, f'note {i}')
+    feedback.flush_feedback()
+
+    rows, cursor = feedback.list_feedback_page(limit=2)
+    assert [r['comments'] for r in rows] == ['note 4', 'note 3']
+    rows, cursor = feedback.list_feedback_page(limit=2, before_id=cursor)
+    assert [r['comments'] for r in rows] == ['note 2', 'note 1']
+    assert feedback.list_feedback_page(limit=10, candidate='cand1')[0][0]['comments'] == 'note 3'
+
+    ts, cand, jd, rating, comments = feedback.list_feedback(1)[0]
+    assert (cand, jd, rating) == ('cand0', 'Python developer', 4)
+    conn = sqlite3.connect(db)
+    assert conn.execute('select count(*) from jd').fetchone()[0] == 1
+    assert conn.execute('select count(*) from feedback where jd is not null').fetchone()[0] == 0
+
+
+def test_legacy_schema_is_migrated(db):
+    conn = sqlite3.connect(db)
+    conn.execute('create table feedback (id integer primary key autoincrement, timestamp varchar, candidate varchar, jd varchar, rating integer, comments varchar)')
+    conn.execute("insert into feedback (timestamp, candidate, jd, rating, comments) values ('2024-01-01T00:00:00', 'old', 'Legacy JD', 4, 'kept')")
+    conn.commit()
+    conn.close()
+
+    assert feedback.list_feedback(5) == [('2024-01-01T00:00:00', 'old', 'Legacy JD', 4, 'kept')]
+    indexes = {i['name'] for i in inspect(feedback._engine).get_indexes('feedback')}
+    assert 'ix_feedback_candidate_timestamp' in indexes
+
+
+def test_rolled_back_insert_does_not_mark_jd_known(db, monkeypatch):
+    feedback._ensure_db()
+    good_table = feedback.feedback_table
+
+    class FailingTable:
+        def insert(self):
+            raise RuntimeError('insert failed')
+
+    monkeypatch.setattr(feedback, 'feedback_table', FailingTable())
+    try:
+        feedback._insert_rows([{'timestamp': 't0', 'candidate': 'a', 'jd': 'Go developer', 'rating': 3, 'comments': ''}])
+    except RuntimeError:
+        pass
+    monkeypatch.setattr(feedback, 'feedback_table', good_table)
+    assert not feedback._known_jd_hashes
+
+    feedback.save_feedback('b', 'Go developer', 5, 'ok', wait=True)
+    assert feedback.list_feedback(1)[0][2] == 'Go developer'
+
+
+def test_failed_write_behind_batch_is_reported(db, monkeypatch):
+    feedback._ensure_db()
+    monkeypatch.setattr(feedback, 'WRITE_BEHIND', True)
+    monkeypatch.setattr(feedback, '_writer', feedback._WriteBehind(interval=0.05))
+
+    def failing_insert(rows):
+        raise RuntimeError('database down')
+
+    monkeypatch.setattr(feedback, '_insert_rows', failing_insert)
+    with pytest.raises(RuntimeError):
+        feedback.save_feedback('a', 'Go developer', 3, 'lost', wait=True)
+    feedback.flush_feedback()  # the error is reported once
+
+
+def test_concurrent_migration_counts_as_done(db, monkeypatch):
+    def migrated_elsewhere(conn):
+        # another process finishes the same migration first
+        conn.execute(feedback.schema_version_table.insert().values(version=1))
+
+    monkeypatch.setattr(feedback, '_MIGRATIONS', [migrated_elsewhere])
+    feedback._ensure_db()
+    assert feedback._db_ready
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Generous ceiling for importing the parsing entry point; the heavy parsers alone take longer
+IMPORT_BUDGET_S = float(os.environ.get('RESUME_IMPORT_BUDGET_S', 0.5))
+HEAVY = ['pdfminer', 'docx', 'pdf2image', 'pytesseract', 'spacy', 'sentence_transformers', 'sklearn']
+
+
+def _run(code):
+    env = {k: v for k, v in os.environ.items() if not k.startswith('RESUME_')}
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_resume_parser_import_is_lazy_and_within_budget():
+    result = _run(
+        'import json, sys, time\n'
+        'start = time.perf_counter()\n'
+        'import resume_parser\n'
+        'elapsed = time.perf_counter() - start\n'
+        f'print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {HEAVY!r} if m in sys.modules]}}))\n'
+    )
+    assert result['loaded'] == []
+    assert result['elapsed'] < IMPORT_BUDGET_S
+
+
+def test_warmup_preloads_parsers_in_background():
+    result = _run(
+        'import json, sys, warmup\n'
+        'warmup.start()\n'
+        'warmup.wait(60)\n'
+        'print(json.dumps({"status": warmup.status(), "pdfminer": "pdfminer.high_level" in sys.modules}))\n'
+    )
+    assert result['status']['ready'] and result['pdfminer']
+    assert result['status']['components']['parsers'] == 'ready'
+    assert result['status']['components']['model'] == 'skipped'
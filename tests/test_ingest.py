@@ -0,0 +1,76 @@
+import io
+import os
+import sys
+import zipfile
+
+# Ensure project root and benchmarks/ are on sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import corpus
+from resume_parser import extract_text_from_file, sniff_format
+
+
+class SizedUpload:
+    """Streamlit-style upload with a declared size that records how much was read."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.size = len(data)
+        self._buf = io.BytesIO(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = self._buf.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def test_oversized_upload_is_rejected_before_reading():
+    upload = SizedUpload('big.pdf', b'%PDF-' + b'x' * 5000)
+    parsed = extract_text_from_file(upload, max_size_bytes=1000, cache=False)
+    assert parsed['text'] == '' and parsed['stats']['counters']['files_rejected_size'] == 1
+    assert upload.bytes_read == 0
+
+    upload.size = None  # no declared size: the read stops one byte past the limit
+    extract_text_from_file(upload, max_size_bytes=1000, cache=False)
+    assert upload.bytes_read == 1001
+
+
+def test_format_is_sniffed_from_content():
+    name, data, text = corpus.generate_corpus(2, fmt='docx', words=60)[1]
+    parsed = extract_text_from_file(SizedUpload('resume.pdf', data), cache=False)
+    assert text.split('\n')[0] in parsed['text']
+    assert parsed['stats']['counters']['format_mismatches'] == 1
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('notes.txt', 'hello')
+    assert sniff_format(buf.getvalue(), buf) == 'binary'
+    assert sniff_format(b'\x89PNG\r\n\x1a\n\x00\x00') == 'binary'
+    assert sniff_format(b'junk\n%PDF-1.4') == 'pdf'
+    assert extract_text_from_file(SizedUpload('cv.txt', buf.getvalue()), cache=False)['text'] == ''
+
+
+def test_parallel_inputs_are_size_checked_before_reading():
+    import screen_cli
+    from resume_parser import extract_texts_parallel
+
+    opened = []
+
+    def opener(data):
+        def open_():
+            f = io.BytesIO(data)
+            opened.append(f)
+            return f
+        return open_
+
+    files = [screen_cli._LazyFile('declared.txt', opener(b'x' * 500), size=500),
+             screen_cli._LazyFile('undeclared.txt', opener(b'y' * 500)),
+             screen_cli._LazyFile('ok.txt', opener(b'Python'), size=6)]
+    outcomes = {o['name']: o for o in extract_texts_parallel(files, max_workers=1, max_size_bytes=100)}
+    assert outcomes['declared.txt']['error']['type'] == 'rejected'
+    assert outcomes['undeclared.txt']['error']['type'] == 'rejected'
+    assert outcomes['ok.txt']['ok']
+    assert len(opened) == 2 and all(f.closed for f in opened)  # declared.txt never opened
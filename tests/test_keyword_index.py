@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from keyword_index import KeywordIndex
+
+
+def test_bm25_ranks_and_updates(tmp_path):
+    index = KeywordIndex()
+    index.add('alice', 'Python developer. Python, pandas and REST APIs.')
+    index.add('bob', {'text': 'Java and Spring developer', 'meta': {}})
+    index.add('carol', 'Pandas analyst', meta={'team': 'data'})
+
+    jd = 'Python developer with pandas experience'
+    ids = [r['id'] for r in index.search(jd, k=3)]
+    assert ids[0] == 'alice'
+    assert set(ids) == {'alice', 'bob', 'carol'}
+
+    index.remove('alice')
+    assert index.doc_freq('python') == 0
+    assert index.search(jd, k=1)[0]['id'] == 'carol'
+
+    path = str(tmp_path / 'kw.json')
+    index.save(path)
+    loaded = KeywordIndex.load(path)
+    assert loaded.search(jd, k=2) == index.search(jd, k=2)
+    assert loaded.search(jd, k=1)[0]['meta'] == {'team': 'data'}
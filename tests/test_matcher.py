@@ -4,7 +4,11 @@ import sys
 # Ensure project root is on sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from matcher import match_with_weights, explain_match
+import numpy as np
+import pytest
+
+import matcher
+from matcher import match_with_weights, match_batch, explain_match
 
 
 def test_keyword_match():
@@ -20,4 +24,98 @@ def test_explain_match():
     resume = {'text': 'Built NLP pipelines and used transformers for classification.'}
     rationale = explain_match(jd, resume, top_k=1)
     assert isinstance(rationale, list)
-    assert len(rationale) == 1
\ No newline at end of file
+    assert len(rationale) == 1
+
+
+def test_match_batch_matches_single():
+    jd = "Python developer with pandas and REST API experience"
+    resumes = [
+        {'text': 'Experience in Python, pandas and building REST APIs', 'meta': {}},
+        'Java and Spring developer',
+        {'text': 'Go services', 'meta': {'skills': ['Python', 'Docker']}},
+    ]
+    batch = match_batch(jd, resumes, weight_embedding=0.0, weight_keywords=1.0, batch_size=2)
+    assert len(batch) == len(resumes)
+    for r, (score, details) in zip(resumes, batch):
+        single_score, single_details = match_with_weights(jd, r, weight_embedding=0.0, weight_keywords=1.0)
+        assert score == single_score
+        assert details['top_keywords'] == single_details['top_keywords']
+
+
+class CountingModel:
+    VOCAB = ['nlp', 'transformers', 'python', 'java']
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32):
+        self.encoded.extend(texts)
+        return [[t.lower().count(w) for w in self.VOCAB] for t in texts]
+
+
+class FailingModel(CountingModel):
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+
+    def encode(self, texts, batch_size=32):
+        if len(self.encoded) >= self.fail_after:
+            raise RuntimeError('encoder crashed')
+        return super().encode(texts, batch_size)
+
+
+def test_match_matrix_does_not_mix_embedding_and_keyword_scores(monkeypatch):
+    jds = ['Python developer', 'Java engineer']
+    resumes = ['Python and pandas', 'Java and Spring', 'NLP with Python']
+    monkeypatch.setattr(matcher, '_ENABLE_EMBEDDINGS', True)
+    # the JDs and the first chunk encode; the second chunk fails
+    monkeypatch.setattr(matcher, '_model', FailingModel(fail_after=4))
+    with pytest.raises(RuntimeError):
+        matcher.match_matrix(jds, iter(resumes), chunk_size=2)
+    # a failure on the first chunk still falls back to keyword-only scoring
+    monkeypatch.setattr(matcher, '_model', FailingModel(fail_after=2))
+    assert matcher.match_matrix(jds, iter(resumes), chunk_size=2)['emb_fallback']
+
+
+def test_explain_match_encodes_jd_once(monkeypatch):
+    model = CountingModel()
+    monkeypatch.setattr(matcher, '_ENABLE_EMBEDDINGS', True)
+    monkeypatch.setattr(matcher, '_model', model)
+    matcher.clear_sentence_cache()
+    jd = 'Looking for NLP engineers. Must know transformers.'
+    for resume in ['Built NLP pipelines. Wrote Java services.', 'Used transformers daily.']:
+        rationale = explain_match(jd, resume, top_k=1)
+        assert rationale[0]['score'] > 0.9
+    assert model.encoded.count('Must know transformers.') == 1
+
+
+def test_combine_scores_matches_direct_scoring():
+    jd = "Python developer with pandas and REST API experience"
+    resumes = ['Experience in Python, pandas and building REST APIs', 'Java and Spring developer']
+    details = [d for _, d in match_batch(jd, resumes)]
+    scores = matcher.combine_scores([d['skill_sim'] for d in details], [d['exp_sim'] for d in details], 0.2, 0.8)
+    for r, s in zip(resumes, scores):
+        assert abs(match_with_weights(jd, r, weight_embedding=0.2, weight_keywords=0.8)[0] - s) < 1e-12
+
+
+def test_match_matrix_matches_pairwise_scoring(monkeypatch):
+    jds = ['Python developer with pandas and REST API experience', 'Java engineer, Spring and microservices',
+           'NLP scientist using transformers']
+    resumes = [
+        {'text': 'Experience in Python, pandas and building REST APIs', 'meta': {}},
+        'Java and Spring developer building microservices',
+        {'text': 'Go services', 'meta': {'skills': ['Python', 'Docker']}},
+        'Built NLP pipelines with transformers and Python',
+        '',
+    ]
+    for embeddings in (False, True):
+        monkeypatch.setattr(matcher, '_ENABLE_EMBEDDINGS', embeddings)
+        monkeypatch.setattr(matcher, '_model', CountingModel())
+        result = matcher.match_matrix(jds, iter(resumes), 0.6, 0.4, top_k=2, chunk_size=2, return_scores=True)
+        assert result['emb_fallback'] is not embeddings
+        expected = np.array([[match_with_weights(jd, r, 0.6, 0.4)[0] for r in resumes] for jd in jds])
+        assert np.allclose(result['scores'], expected, atol=1e-6)
+        for i, top in enumerate(result['by_resume']):
+            assert [j for j, _ in top] == list(np.argsort(-expected[:, i], kind='stable')[:2])
+        for j, top in enumerate(result['by_jd']):
+            assert [i for i, _ in top] == list(np.argsort(-expected[j], kind='stable')[:2])
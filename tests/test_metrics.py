@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import metrics
+from matcher import match_with_weights
+from resume_parser import extract_text_from_file
+
+
+def test_stage_timings_reach_details_and_prometheus(fake_upload):
+    metrics.REGISTRY.reset()
+    parsed = extract_text_from_file(fake_upload('alice.txt', 'Python and pandas developer'), cache=False)
+    score, details = match_with_weights('Python developer', parsed, weight_embedding=0.0, weight_keywords=1.0)
+    assert 'keywords' in details['timings']
+    assert details['parse_stats']['counters']['files_parsed'] == 1
+
+    snap = metrics.REGISTRY.snapshot()
+    assert snap['stages']['keywords']['count'] == 1
+    assert snap['counters']['embedding_fallbacks'] == 1
+    text = metrics.REGISTRY.to_prometheus()
+    assert 'resume_stage_seconds{stage="keywords",quantile="0.95"}' in text
+    assert 'resume_files_parsed_total 1' in text
@@ -0,0 +1,48 @@
+import io
+import os
+import sys
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import resume_parser
+
+
+class FakeTesseract:
+    @staticmethod
+    def image_to_string(img):
+        return f'page {img}'
+
+
+def test_ocr_rasterizes_only_needed_pages(monkeypatch):
+    calls = []
+
+    def fake_convert(data, dpi=200, first_page=None, last_page=None):
+        calls.append((first_page, last_page))
+        return list(range(first_page, min(last_page, 60) + 1))
+
+    monkeypatch.setattr(resume_parser, 'convert_from_bytes', fake_convert)
+    monkeypatch.setattr(resume_parser, 'pytesseract', FakeTesseract)
+    monkeypatch.setattr(resume_parser, '_pdf_page_count', lambda data: 60)
+    monkeypatch.setenv('RESUME_OCR_WORKERS', '3')
+    monkeypatch.setenv('RESUME_OCR_PAGES_IN_FLIGHT', '4')
+
+    timings = []
+    text = resume_parser._ocr_pdf_bytes(b'%PDF', max_pages=10, timings=timings)
+    assert text == '\n'.join(f'page {i}' for i in range(1, 11))
+    assert calls == [(1, 4), (5, 8), (9, 10)]
+    assert [t['page'] for t in timings] == list(range(1, 11))
+
+
+def test_ocr_page_timings_are_returned_in_stats(monkeypatch):
+    monkeypatch.setattr(resume_parser, 'convert_from_bytes',
+                        lambda data, dpi=200, first_page=None, last_page=None: list(range(first_page, min(last_page, 3) + 1)))
+    monkeypatch.setattr(resume_parser, 'pytesseract', FakeTesseract)
+    monkeypatch.setattr(resume_parser, '_pdf_page_count', lambda data: 3)
+
+    scan = io.BytesIO(b'%PDF-1.4 scanned')
+    scan.name = 'scan.pdf'
+    result = resume_parser.extract_text_from_file(scan, cache=False)
+    assert result['text'] == 'page 1\npage 2\npage 3'
+    assert [p['page'] for p in result['stats']['ocr_pages']] == [1, 2, 3]
+    assert result['stats']['counters']['ocr_pages'] == 3
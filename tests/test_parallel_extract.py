@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import resume_parser
+from resume_parser import extract_texts_parallel
+
+
+def test_parallel_extract_returns_every_file():
+    files = [(f'r{i}.txt', f'Resume {i} Python'.encode('utf-8')) for i in range(5)]
+    outcomes = list(extract_texts_parallel(files, max_workers=2, timeout=30))
+    assert sorted(o['index'] for o in outcomes) == list(range(5))
+    assert all(o['ok'] for o in outcomes)
+    by_index = {o['index']: o for o in outcomes}
+    assert by_index[3]['result']['text'] == 'Resume 3 Python'
+
+
+def _slow_extract(fmt, fp, timings=None, counters=None, structured=True, ocr_pages=None):
+    text = fp.read().decode('utf-8')
+    if text == 'stuck':
+        time.sleep(30)
+    return {'text': text, 'meta': {}}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='patch must be inherited by workers')
+def test_parallel_extract_times_out_single_file(monkeypatch):
+    monkeypatch.setattr(resume_parser, '_extract_file', _slow_extract)
+    files = [('slow.txt', b'stuck'), ('a.txt', b'fine'), ('b.txt', b'also fine')]
+    start = time.monotonic()
+    outcomes = list(extract_texts_parallel(files, max_workers=2, timeout=1, max_size_bytes=100))
+    assert time.monotonic() - start < 15
+    by_name = {o['name']: o for o in outcomes}
+    assert by_name['slow.txt']['error']['type'] == 'timeout'
+    assert by_name['a.txt']['ok'] and by_name['b.txt']['ok']
+
+
+def _crashing_extract(fmt, fp, timings=None, counters=None, structured=True, ocr_pages=None):
+    text = fp.read().decode('utf-8')
+    if text == 'boom':
+        os._exit(1)
+    time.sleep(0.2)  # keep the other files in flight when the worker dies
+    return {'text': text, 'meta': {}}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='patch must be inherited by workers')
+def test_worker_crash_only_fails_the_file_that_caused_it(monkeypatch):
+    monkeypatch.setattr(resume_parser, '_extract_file', _crashing_extract)
+    files = [('a.txt', b'fine'), ('bad.txt', b'boom'), ('b.txt', b'also fine'), ('c.txt', b'ok too')]
+    by_name = {o['name']: o for o in extract_texts_parallel(files, max_workers=4, timeout=30, max_size_bytes=100)}
+    assert by_name['bad.txt']['error']['type'] == 'crashed'
+    assert all(by_name[n]['ok'] for n in ('a.txt', 'b.txt', 'c.txt'))
+    assert by_name['c.txt']['result']['text'] == 'ok too'
+
+
+def test_rejected_files_come_back_as_errors():
+    files = [('big.txt', b'x' * 200), ('logo.png', b'\x89PNG\r\n\x1a\n\x00\x00'), ('empty.txt', b''),
+             ('ok.txt', b'Python')]
+    outcomes = {o['name']: o for o in extract_texts_parallel(files, max_workers=2, timeout=30, max_size_bytes=100)}
+    for name in ('big.txt', 'logo.png', 'empty.txt'):
+        assert not outcomes[name]['ok'] and outcomes[name]['error']['type'] == 'rejected'
+    assert outcomes['ok.txt']['ok']
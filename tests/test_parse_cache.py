@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from parse_cache import ParseCache
+from resume_parser import extract_text_from_file
+
+
+def test_cache_hit_and_miss(tmp_path, fake_upload):
+    cache = ParseCache(str(tmp_path))
+    first = extract_text_from_file(fake_upload('a.txt', 'Python and pandas'), cache=cache)
+    second = extract_text_from_file(fake_upload('b.txt', 'Python and pandas'), cache=cache)
+    assert (first['text'], first['meta']) == (second['text'], second['meta'])
+    assert second['stats']['counters']['parse_cache_hits'] == 1
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(str(tmp_path), max_bytes=260)
+    keys = [ParseCache.make_key(str(i).encode()) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {'text': 'x' * 60, 'meta': {}})
+        os.utime(os.path.join(str(tmp_path), key + '.json'), (i, i))
+    cache.put(ParseCache.make_key(b'new'), {'text': 'y' * 60, 'meta': {}})
+    assert cache.get(keys[0]) is None
+    assert cache.stats()['bytes'] <= 260
+
+
+def test_text_only_extraction_is_cached_separately(tmp_path, fake_upload):
+    cache = ParseCache(str(tmp_path))
+    text_only = extract_text_from_file(fake_upload('a.txt', 'Python and pandas'), cache=cache, structured=False)
+    full = extract_text_from_file(fake_upload('b.txt', 'Python and pandas'), cache=cache)
+    assert text_only['meta'] == {} and full['meta']['skills'] == ['Python', 'pandas']
+    assert cache.stats()['misses'] == 2
+
+
+def test_overwrites_and_other_processes_are_counted(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path), max_bytes=300)
+    key = ParseCache.make_key(b'same')
+    for _ in range(5):
+        cache.put(key, {'text': 'x' * 60, 'meta': {}})
+    assert cache.stats()['bytes'] == os.path.getsize(os.path.join(str(tmp_path), key + '.json'))
+
+    # a second process sharing the directory: each instance only sees its own writes until it re-stats
+    monkeypatch.setattr('parse_cache.RESCAN_INTERVAL', 0)
+    other = ParseCache(str(tmp_path), max_bytes=300)
+    for i in range(6):
+        (cache if i % 2 else other).put(ParseCache.make_key(str(i).encode()), {'text': 'y' * 60, 'meta': {}})
+    on_disk = sum(os.path.getsize(os.path.join(str(tmp_path), n)) for n in os.listdir(str(tmp_path)))
+    assert on_disk <= 300
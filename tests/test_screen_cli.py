@@ -0,0 +1,60 @@
+import json
+import os
+import sys
+import zipfile
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import screen_cli
+
+
+def _write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_cli_writes_results_and_resumes_from_checkpoint(tmp_path):
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    _write(resumes / 'alice.txt', 'Python developer with pandas and REST APIs')
+    _write(resumes / 'bob.txt', 'Java and Spring developer')
+    with zipfile.ZipFile(tmp_path / 'more.zip', 'w') as zf:
+        zf.writestr('carol.txt', 'Python and pandas analyst')
+    jd = _write(tmp_path / 'jd.txt', 'Python developer with pandas')
+    out = str(tmp_path / 'results.jsonl')
+    ranked = str(tmp_path / 'ranked.jsonl')
+
+    args = [str(resumes), str(tmp_path / 'more.zip'), '--jd', jd, '--out', out,
+            '--workers', '2', '--batch-size', '2', '--weight-embedding', '0', '--weight-keywords', '1']
+    assert screen_cli.main(args + ['--ranked', ranked]) == 0
+    rows = [json.loads(line) for line in open(out, encoding='utf-8')]
+    assert len(rows) == 3
+    top = json.loads(open(ranked, encoding='utf-8').readline())
+    assert top['candidate'].endswith('alice.txt')
+
+    # a second run finds everything in the checkpoint and appends nothing
+    stats = screen_cli.run(screen_cli.build_parser().parse_args(args))
+    assert stats['skipped'] == 3 and stats['processed'] == 0
+    assert len(open(out, encoding='utf-8').readlines()) == 3
+
+
+def test_cli_parses_structured_fields_in_batches(tmp_path, monkeypatch):
+    calls = []
+
+    def parse_many(self, texts):
+        calls.append(list(texts))
+        return [{'skills': ['Docker']} for _ in texts]
+
+    monkeypatch.setattr(screen_cli.StructuredParserPool, 'parse_many', parse_many)
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    for name in ('a', 'b', 'c'):
+        _write(resumes / f'{name}.txt', 'Python developer')
+    jd = _write(tmp_path / 'jd.txt', 'Python developer with Docker')
+    out = str(tmp_path / 'results.jsonl')
+    screen_cli.main([str(resumes), '--jd', jd, '--out', out, '--workers', '1', '--batch-size', '2',
+                     '--weight-embedding', '0', '--weight-keywords', '1'])
+    assert [len(texts) for texts in calls] == [2, 1]
+    rows = [json.loads(line) for line in open(out, encoding='utf-8')]
+    assert all('docker' in row['top_keywords'] for row in rows)
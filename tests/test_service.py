@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip('fastapi')
+pytest.importorskip('httpx')
+from fastapi.testclient import TestClient
+
+import service
+
+
+def test_job_streams_results_as_ndjson():
+    with TestClient(service.app) as client:
+        files = [
+            ('files', ('alice.txt', b'Python developer with pandas and REST APIs', 'text/plain')),
+            ('files', ('bob.txt', b'Java and Spring', 'text/plain')),
+        ]
+        resp = client.post('/jobs', data={'jd_text': 'Python developer with pandas', 'weight_embedding': '0', 'weight_keywords': '1'}, files=files)
+        assert resp.status_code == 202
+        job_id = resp.json()['job_id']
+
+        resp = client.get(f'/jobs/{job_id}/results')
+        assert resp.headers['content-type'].startswith('application/x-ndjson')
+        results = {r['name']: r for r in map(json.loads, resp.text.splitlines())}
+        assert set(results) == {'alice.txt', 'bob.txt'}
+        assert results['alice.txt']['score'] > results['bob.txt']['score']
+
+        status = client.get(f'/jobs/{job_id}').json()
+        assert status['status'] == 'done'
+        assert status['processed'] == 2
+
+
+def test_unknown_job_is_404():
+    with TestClient(service.app) as client:
+        assert client.get('/jobs/missing').status_code == 404
+        assert client.delete('/jobs/missing').status_code == 404
+
+
+def test_jobs_share_the_extraction_workers(monkeypatch):
+    seen = []
+
+    def fake_extract(files, max_workers=None, **kwargs):
+        seen.append(max_workers)
+        yield from ()
+
+    monkeypatch.setattr(service, 'extract_texts_parallel', fake_extract)
+    monkeypatch.setattr(service, 'JOB_WORKERS', 3)
+    with TestClient(service.app) as client:
+        resp = client.post('/jobs', data={'jd_text': 'Python'}, files=[('files', ('a.txt', b'Python', 'text/plain'))])
+        client.get(f"/jobs/{resp.json()['job_id']}/results")
+    assert seen == [3]
+
+
+def test_oversized_file_is_rejected_alone(monkeypatch):
+    monkeypatch.setattr(service, 'MAX_FILE_BYTES', 100)
+    with TestClient(service.app) as client:
+        files = [('files', ('big.txt', b'x' * 200, 'text/plain')), ('files', ('ok.txt', b'Python', 'text/plain'))]
+        resp = client.post('/jobs', data={'jd_text': 'Python'}, files=files)
+        assert resp.status_code == 202
+        results = {r['name']: r for r in map(json.loads, client.get(f"/jobs/{resp.json()['job_id']}/results").text.splitlines())}
+    assert results['big.txt']['error']['type'] == 'rejected'
+    assert results['ok.txt']['ok']
+
+
+def test_full_queue_refuses_new_jobs(monkeypatch):
+    monkeypatch.setattr(service, 'MAX_QUEUED_JOBS', 0)
+    with TestClient(service.app) as client:
+        resp = client.post('/jobs', data={'jd_text': 'Python'}, files=[('files', ('a.txt', b'Python', 'text/plain'))])
+    assert resp.status_code == 503
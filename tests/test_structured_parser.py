@@ -0,0 +1,75 @@
+import os
+import sys
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import structured_parser
+
+
+class _Ent:
+    def __init__(self, text, label, start):
+        self.text, self.label_, self.start_char = text, label, start
+
+
+class _Doc:
+    def __init__(self, text):
+        self.ents = [_Ent('Alice Example', 'PERSON', 0)] if text.startswith('Alice') else []
+        if 'ExampleAI' in text:
+            self.ents.append(_Ent('ExampleAI', 'ORG', text.index('ExampleAI')))
+
+
+class FakeNLP:
+    def __init__(self):
+        self.pipe_calls = 0
+
+    def __call__(self, text):
+        return _Doc(text)
+
+    def pipe(self, texts, batch_size=32):
+        self.pipe_calls += 1
+        return (_Doc(t) for t in texts)
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'samples', 'alice.txt')
+
+
+def test_extract_fields_from_text():
+    with open(SAMPLE, encoding='utf-8') as f:
+        text = f.read() + '\nalice@example.com  +1 415 555 0100\n'
+    meta = structured_parser.extract_fields(text, _Doc(text))
+    assert meta['name'] == 'Alice Example'
+    assert meta['email'] == 'alice@example.com'
+    assert meta['mobile_number'] == '+1 415 555 0100'
+    assert {'Python', 'PyTorch', 'transformers', 'NLP', 'REST', 'Docker', 'pandas'} <= set(meta['skills'])
+    assert meta['total_experience'] == 6
+    assert meta['experience'][0].startswith('NLP Engineer at ExampleAI')
+    assert meta['company_names'] == ['ExampleAI']
+    assert meta['degree'] == ['B.Sc. Computer Science']
+
+
+def test_parse_batch_uses_one_resident_pipe(monkeypatch):
+    nlp = FakeNLP()
+    monkeypatch.setattr(structured_parser, '_nlp', nlp)
+    texts = ['Alice Example\nPython and Docker', 'Bob\nSQL', '']
+    out = structured_parser.parse_batch(texts)
+    assert nlp.pipe_calls == 1
+    assert out[0]['skills'] == ['Python', 'Docker'] and out[0]['name'] == 'Alice Example'
+    assert out[1]['skills'] == ['SQL']
+    assert structured_parser.StructuredParserPool(workers=1).parse_many(texts) == out
+
+
+def test_regex_fields_do_not_need_spacy(monkeypatch):
+    monkeypatch.setattr(structured_parser, '_nlp', None)
+    monkeypatch.setattr(structured_parser, '_nlp_failed', True)
+    meta = structured_parser.parse('Knows Python and SQL. Reach me at a@b.io')
+    assert meta['skills'] == ['Python', 'SQL'] and meta['email'] == 'a@b.io'
+    assert 'company_names' not in meta
+    assert structured_parser.parse_batch(['Python', 'SQL']) == [structured_parser.parse('Python'), structured_parser.parse('SQL')]
+
+
+def test_ordinary_words_are_not_skills():
+    meta = structured_parser.extract_fields('I go home and rest. Led R&D, excel at spring planning.')
+    assert 'skills' not in meta
+    meta = structured_parser.extract_fields('Skills: python, Go, REST APIs, R, Excel, Spring Boot')
+    assert meta['skills'] == ['Python', 'Go', 'REST', 'R', 'Excel', 'Spring Boot']
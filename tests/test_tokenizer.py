@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from matcher import match_with_weights, explain_match
+from tokenizer import extract_keywords, prepare
+from ui_helpers import extract_snippets
+
+JD = 'Looking for a Python developer. Needs pandas, NLP and REST APIs! Python is a must.'
+RESUME = 'Alice built NLP systems in Python. She used pandas and REST. Docker too? Yes, Python again.'
+
+
+def test_prepared_document_matches_plain_text():
+    jd_doc, res_doc = prepare(JD), prepare(RESUME)
+    for k in (1, 3, 40, 120):
+        assert jd_doc.top_keywords(k) == extract_keywords(JD, top_k=k)
+    prepared_score, prepared_details = match_with_weights(jd_doc, {'text': res_doc, 'meta': {}}, 0.0, 1.0)
+    plain_score, plain_details = match_with_weights(JD, {'text': RESUME, 'meta': {}}, 0.0, 1.0)
+    assert prepared_score == plain_score
+    prepared_details.pop('timings')
+    plain_details.pop('timings')
+    assert prepared_details == plain_details
+    assert explain_match(jd_doc, res_doc, top_k=2) == explain_match(JD, RESUME, top_k=2)
+    assert extract_snippets(res_doc, ['pandas', 'docker']) == extract_snippets(RESUME, ['pandas', 'docker'])
@@ -0,0 +1,41 @@
+import csv
+import io
+import os
+import sys
+
+# Ensure project root is on sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ui_helpers import extract_snippets, get_matcher, highlight_text, iter_csv
+
+
+def test_iter_csv_streams_quoted_rows_in_chunks():
+    rows = ({'candidate': f'cv "{i}".pdf', 'score': i / 10, 'top_keywords': 'python,sql'} for i in range(5))
+    chunks = list(iter_csv(rows, ['candidate', 'score', 'top_keywords'], chunk_rows=2))
+    assert len(chunks) == 3
+    parsed = list(csv.DictReader(io.StringIO(''.join(chunks))))
+    assert [r['candidate'] for r in parsed] == [f'cv "{i}".pdf' for i in range(5)]
+    assert parsed[3]['top_keywords'] == 'python,sql'
+
+
+def test_highlight_whole_words_longest_keyword_wins():
+    out = highlight_text('Machine learning and Learning-rate tuning; unlearning', ['learning', 'machine learning'],
+                         mark_style='x')
+    assert out == ("<span style='x'>Machine learning</span> and <span style='x'>Learning</span>-rate tuning; "
+                   "unlearning")
+
+
+def test_highlight_renders_whole_word_spans():
+    text = 'Learning-rate tuning; unlearning, machine learning'
+    matcher = get_matcher(['learning', 'machine learning'])
+    spans = matcher.whole_words(text)
+    assert [text[a:b] for a, b in spans] == ['Learning', 'machine learning']
+    assert matcher.highlight(text, 'x', spans=spans) == highlight_text(text, matcher, mark_style='x')
+
+
+def test_extract_snippets_crops_around_earliest_keyword():
+    text = 'Intro line. ' + 'a' * 100 + ' sql then python here. Nothing else.'
+    matcher = get_matcher(['python', 'sql'])
+    assert get_matcher(['SQL', 'python']) is matcher
+    (snippet,) = extract_snippets(text, matcher, chars_each_side=10)
+    assert snippet == '...aaaaaaaaa sql then p...'
@@ -0,0 +1,98 @@
+import heapq
+import re
+from operator import itemgetter
+
+
+_WORD_RE = re.compile(r"\b[a-zA-Z][a-zA-Z0-9+#.+-]{1,}\b")
+_SENT_RE = re.compile(r'(?<=[\.!?])\s+')
+_STOPWORDS = frozenset(["the", "and", "for", "with", "a", "an", "to", "in", "on", "of", "is", "are", "as", "by", "from"])
+
+
+def tokenize(text):
+    """Return the lowercased keyword terms of `text` in order (stopwords and short words removed).
+
+    This is the tokenizer behind `extract_keywords`; indexes built over resumes use it too so
+    their terms line up with the JD keywords.
+    """
+    return [w for w in _WORD_RE.findall((text or '').lower()) if w not in _STOPWORDS and len(w) >= 3]
+
+
+def _count(terms):
+    freq = {}
+    for w in terms:
+        freq[w] = freq.get(w, 0) + 1
+    return freq
+
+
+def _top(freq, top_k):
+    # nlargest is documented as sorted(..., reverse=True)[:n], so ties keep first-seen order
+    return [w for w, _ in heapq.nlargest(top_k, freq.items(), key=itemgetter(1))]
+
+
+class PreparedDocument:
+    """A document tokenized once, shared by the matcher and the UI helpers.
+
+    Holds the term counts (in first-occurrence order) and lazily caches top-k keyword lists,
+    sentence splits and per-sentence word sets so repeated calls reuse the same work.
+    """
+
+    __slots__ = ('text', 'counts', '_lower', '_top', '_splits', '_sentence_words')
+
+    def __init__(self, text):
+        self.text = text or ''
+        self.counts = _count(tokenize(self.text))
+        self._lower = None
+        self._top = {}
+        self._splits = {}
+        self._sentence_words = {}
+
+    def __repr__(self):
+        return f'PreparedDocument({len(self.text)} chars, {len(self.counts)} terms)'
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    def top_keywords(self, top_k=20):
+        """Same result as `extract_keywords(self.text, top_k)`."""
+        out = self._top.get(top_k)
+        if out is None:
+            out = self._top[top_k] = _top(self.counts, top_k)
+        return list(out)
+
+    def split(self, pattern):
+        """Return `pattern.split(text)` (unstripped), cached per compiled pattern."""
+        out = self._splits.get(pattern)
+        if out is None:
+            out = self._splits[pattern] = pattern.split(self.text)
+        return out
+
+    def sentences(self):
+        """Stripped, non-empty sentences split on terminal punctuation."""
+        out = self._splits.get(None)
+        if out is None:
+            out = self._splits[None] = [s.strip() for s in self.split(_SENT_RE) if s.strip()]
+        return out
+
+    def sentence_words(self, i):
+        """Set of all lowercased words (no stopword filtering) in sentence `i` of `sentences()`."""
+        out = self._sentence_words.get(i)
+        if out is None:
+            out = self._sentence_words[i] = set(_WORD_RE.findall(self.sentences()[i].lower()))
+        return out
+
+
+def prepare(text):
+    """Return a PreparedDocument for `text` (a PreparedDocument is returned unchanged)."""
+    if isinstance(text, PreparedDocument):
+        return text
+    return PreparedDocument(text)
+
+
+def extract_keywords(text, top_k=20):
+    # very simple keyword extraction: return frequent words excluding stopwords
+    if isinstance(text, PreparedDocument):
+        return text.top_keywords(top_k)
+    return _top(_count(tokenize(text)), top_k)
@@ -1,63 +1,151 @@
+import csv
+import functools
+import io
 import re
+from tokenizer import PreparedDocument
 
 
-def highlight_text(text, keywords, mark_style="background-color: #ffd7a3; color: #0f1724; padding: 0 3px; border-radius: 3px;"):
+_SNIPPET_SENT_RE = re.compile(r'(?<=[\\.!?])\s+')
+
+
+DEFAULT_MARK_STYLE = "background-color: #ffd7a3; color: #0f1724; padding: 0 3px; border-radius: 3px;"
+
+
+def _trie_pattern(words):
+    """Regex for a keyword set, factored through a trie so each position needs one walk.
+
+    Branches differ in their first character, so the regex engine never retries a shared
+    prefix, and an optional tail (`(?:...)?`) tries the longer keyword before the shorter one.
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ''
+        body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+        if '' in node:
+            return ('(?:' + body + ')?') if len(alts) == 1 else body + '?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Multi-keyword matcher compiled once per keyword set and reused for every text.
+
+    The keywords are merged into a trie and compiled into two regexes: one for any occurrence
+    (snippet selection and cropping) and one for whole-word matches (`whole_words`, which
+    `highlight` renders). Matching is case-insensitive. At one start position the longest
+    keyword wins.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(sorted({k.lower() for k in keywords if k}))
+        pattern = _trie_pattern(self.keywords) if self.keywords else None
+        # keywords are lower-cased, so `first` searches lower-cased text without IGNORECASE,
+        # which is markedly faster in the re engine
+        self._any = re.compile(pattern) if pattern else None
+        self._word = re.compile(r'\b(?:' + pattern + r')\b', re.IGNORECASE) if pattern else None
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def first(self, text):
+        """Start offset of the earliest keyword occurrence (case-insensitive substring), or -1."""
+        if self._any is None:
+            return -1
+        m = self._any.search(text.lower())
+        return m.start() if m else -1
+
+    def whole_words(self, text):
+        """Non-overlapping whole-word (\\b...\\b) matches as (start, end), left to right."""
+        if self._word is None:
+            return []
+        return [m.span() for m in self._word.finditer(text)]
+
+    def highlight(self, text, mark_style=DEFAULT_MARK_STYLE, spans=None):
+        """Wrap whole-word matches in styled spans; pass `spans` from `whole_words` to reuse a scan."""
+        if not text:
+            return ""
+        if spans is None:
+            spans = self.whole_words(text)
+        out = []
+        pos = 0
+        for start, end in spans:
+            out.append(text[pos:start])
+            out.append(f"<span style='{mark_style}'>" + text[start:end] + "</span>")
+            pos = end
+        out.append(text[pos:])
+        return ''.join(out)
+
+
+@functools.lru_cache(maxsize=256)
+def _compiled(keywords):
+    return KeywordMatcher(keywords)
+
+
+def get_matcher(keywords):
+    """Return the compiled `KeywordMatcher` for a keyword set (cached per distinct set)."""
+    if isinstance(keywords, KeywordMatcher):
+        return keywords
+    return _compiled(frozenset(k.lower() for k in keywords if k))
+
+
+def highlight_text(text, keywords, mark_style=DEFAULT_MARK_STYLE):
     """Return HTML-safe text with keywords wrapped in a styled <span> for highlighting.
 
     - text: the source string
-    - keywords: iterable of keywords (lowercased recommended)
+    - keywords: iterable of keywords (lowercased recommended) or a `KeywordMatcher`
     - mark_style: inline CSS for the highlighted span
+
+    Whole-word, case-insensitive matches only; where keywords overlap the longest one wins.
     """
     if not text or not keywords:
         return text or ""
-
-    # build regex to match whole words (case-insensitive)
-    kw_escaped = [re.escape(k) for k in set([k for k in keywords if k])]
-    if not kw_escaped:
-        return text
-    pattern = r"\b(" + "|".join(kw_escaped) + r")\b"
-
-    def _repl(m):
-        return f"<span style='{mark_style}'>" + m.group(0) + "</span>"
-
-    try:
-        return re.sub(pattern, _repl, text, flags=re.IGNORECASE)
-    except Exception:
-        return text
+    return get_matcher(keywords).highlight(text, mark_style)
 
 
 def extract_snippets(text, keywords, max_snippets=2, chars_each_side=60):
     """Find up to max_snippets fragments that contain keywords. Return list of snippets.
 
     If no keywords are found, return the first few sentences.
+    text may be a `tokenizer.PreparedDocument`, in which case its cached sentence split is reused.
+    keywords may be a `KeywordMatcher`; each sentence is scanned once, and the earliest keyword
+    occurrence both selects the sentence and centres the crop.
     """
+    if isinstance(text, PreparedDocument):
+        doc = text
+        text = doc.text
+    else:
+        doc = None
     if not text:
         return []
 
     # split into sentences (simple)
-    sentences = re.split(r'(?<=[\\.!?])\s+', text)
+    sentences = doc.split(_SNIPPET_SENT_RE) if doc is not None else _SNIPPET_SENT_RE.split(text)
+    matcher = get_matcher(keywords)
     hits = []
-    kws = set([k.lower() for k in keywords if k])
     for s in sentences:
-        s_lower = s.lower()
-        if any(kw in s_lower for kw in kws):
-            hits.append(s.strip())
+        s = s.strip()
+        idx = matcher.first(s)
+        if idx >= 0:
+            hits.append((s, idx))
         if len(hits) >= max_snippets:
             break
 
     if not hits:
         # fallback: first N sentences
-        hits = [s.strip() for s in sentences[:max_snippets]]
+        hits = [(s.strip(), 0) for s in sentences[:max_snippets]]
 
-    # crop snippets to chars_each_side around first keyword occurrence
+    # crop snippets to chars_each_side around the first keyword occurrence
     cropped = []
-    for s in hits:
-        idx = 0
-        for kw in kws:
-            i = s.lower().find(kw)
-            if i >= 0:
-                idx = i
-                break
+    for s, idx in hits:
         start = max(0, idx - chars_each_side)
         end = min(len(s), idx + chars_each_side)
         prefix = '...' if start > 0 else ''
@@ -65,3 +153,24 @@ def extract_snippets(text, keywords, max_snippets=2, chars_each_side=60):
         cropped.append(prefix + s[start:end].strip() + suffix)
 
     return cropped
+
+
+def iter_csv(rows, fieldnames, chunk_rows=500):
+    """Yield CSV text for an iterable of dict rows, header first, `chunk_rows` rows per chunk.
+
+    Rows are written with the csv module as they are consumed, so no table is materialised.
+    """
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction='ignore')
+    writer.writeheader()
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+            pending = 0
+    if buf.tell():
+        yield buf.getvalue()
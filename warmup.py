@@ -0,0 +1,105 @@
+"""Background warm-up of parsers and the embedding model.
+
+Heavy dependencies are imported on first use, so a fresh process can serve its first page
+quickly. `start()` then preloads them on a daemon thread: the embedding model (when embeddings
+are enabled), the PDF/DOCX/OCR parsers and the spaCy pipeline for structured fields. Callers
+poll `status()` / `is_ready()` to show readiness, or `wait()` to block. Anything the warm-up
+has not reached yet is still loaded on demand by the code that needs it.
+
+Set RESUME_WARMUP=0 to disable it (`start()` then returns without doing anything).
+"""
+import logging
+import os
+import threading
+import time
+
+import metrics
+
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get('RESUME_WARMUP', '1') in ('1', 'true', 'True')
+
+
+def _warm_model():
+    import matcher
+    if not matcher._ENABLE_EMBEDDINGS:
+        return 'skipped'
+    matcher._get_model()
+
+
+def _warm_parsers():
+    import resume_parser
+    resume_parser.warm_up()
+
+
+def _warm_structured():
+    import structured_parser
+    if not structured_parser.available():
+        return 'skipped'
+
+
+# Order matters: the model is what the first screening run waits on longest
+TASKS = [
+    ('model', _warm_model),
+    ('parsers', _warm_parsers),
+    ('structured', _warm_structured),
+]
+
+_lock = threading.Lock()
+_thread = None
+_done = threading.Event()
+_status = {name: 'pending' for name, _ in TASKS}
+_started = None
+_finished = None
+
+
+def _run():
+    global _finished
+    for name, task in TASKS:
+        with _lock:
+            _status[name] = 'loading'
+        try:
+            with metrics.timed('warmup_' + name):
+                state = task() or 'ready'
+        except Exception as e:
+            logger.warning('Warm-up of %s failed: %s', name, e)
+            state = 'failed'
+        with _lock:
+            _status[name] = state
+    _finished = time.monotonic()
+    _done.set()
+
+
+def start():
+    """Start the warm-up thread once per process; returns True if it is (or was) started."""
+    global _thread, _started
+    if not ENABLED:
+        return False
+    with _lock:
+        if _thread is None:
+            _started = time.monotonic()
+            _thread = threading.Thread(target=_run, name='warmup', daemon=True)
+            _thread.start()
+    return True
+
+
+def is_ready():
+    return _done.is_set()
+
+
+def wait(timeout=None):
+    """Block until the warm-up finishes (or `timeout` seconds pass); returns is_ready()."""
+    if _thread is None:
+        return False
+    return _done.wait(timeout)
+
+
+def status():
+    """Return {'started', 'ready', 'elapsed', 'components': {name: pending|loading|ready|skipped|failed}}."""
+    with _lock:
+        components = dict(_status)
+    elapsed = None
+    if _started is not None:
+        elapsed = (_finished or time.monotonic()) - _started
+    return {'started': _thread is not None, 'ready': _done.is_set(), 'elapsed': elapsed, 'components': components}